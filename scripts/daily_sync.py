@@ -15,6 +15,7 @@
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
@@ -30,6 +31,13 @@ from src.data.repository.trading_calendar import TradingCalendarRepository
 from src.data.repository.stock_pool import StockPoolRepository
 
 
+# 交易日历增量同步时重新拉取的近期天数
+CALENDAR_REFRESH_DAYS = 30
+
+# 交易日历同步的交易所 {代码: 名称}
+CALENDAR_EXCHANGES = {"SHSE": "上交所", "SZSE": "深交所"}
+
+
 # ============================================================
 # 日志配置
 # ============================================================
@@ -66,6 +74,26 @@ def setup_logging() -> None:
 # 同步任务
 # ============================================================
 
+def _calendar_fetch_start(
+    repo: TradingCalendarRepository,
+    exchange: str,
+    start_date: date,
+    today: date,
+) -> date:
+    """
+    计算交易日历需要重新写入的起始日期
+
+    已入库的历史日历不会再变化，库中数据覆盖 start_date 时只需重新拉取
+    近 CALENDAR_REFRESH_DAYS 天及之后的部分（休市安排可能临时调整）；
+    若库中数据早于该窗口就已中断，则从库中最后日期开始补齐。
+    """
+    cached_start, cached_end = repo.get_date_range(exchange)
+    if cached_start is None or cached_start > start_date:
+        return start_date
+    refresh_start = today - timedelta(days=CALENDAR_REFRESH_DAYS)
+    return max(start_date, min(cached_end, refresh_start))
+
+
 def sync_trading_calendar(
     client: JuejinClient,
     repo: TradingCalendarRepository,
@@ -101,17 +129,32 @@ def sync_trading_calendar(
     start_date = date(today.year - 1, today.month, 1)
     end_date = today + timedelta(days=180)  # 往后半年
 
-    # 上海交易所
-    shse_days = client.get_trading_calendar("SHSE", start_date, end_date)
-    shse_count = repo.save(shse_days)
-    logger.info(f"上交所交易日历: {shse_count} 条")
-
-    # 深圳交易所
-    szse_days = client.get_trading_calendar("SZSE", start_date, end_date)
-    szse_count = repo.save(szse_days)
-    logger.info(f"深交所交易日历: {szse_count} 条")
-
-    logger.success(f"交易日历同步完成，共 {shse_count + szse_count} 条")
+    # 写入起点：只有该日期及之后的日历会被覆盖
+    starts = {
+        exchange: start_date if force else _calendar_fetch_start(repo, exchange, start_date, today)
+        for exchange in CALENDAR_EXCHANGES
+    }
+    # 拉取起点再往前取一个已入库交易日，使写入起点后首个交易日的 prev_trading_day 能从拉取结果算出
+    fetch_starts = {
+        exchange: repo.get_prev_trading_day(exchange, start) or start
+        for exchange, start in starts.items()
+    }
+
+    # 两个交易所的网络拉取互不依赖，并发执行；写库仍在主线程按交易所逐个完成
+    with ThreadPoolExecutor(max_workers=len(CALENDAR_EXCHANGES)) as executor:
+        futures = {
+            exchange: executor.submit(client.get_trading_calendar, exchange, fetch_starts[exchange], end_date)
+            for exchange in CALENDAR_EXCHANGES
+        }
+
+    total_count = 0
+    for exchange, name in CALENDAR_EXCHANGES.items():
+        days = [day for day in futures[exchange].result() if day.date >= starts[exchange]]
+        count = repo.save(days)
+        logger.info(f"{name}交易日历: {count} 条 ({starts[exchange]} ~ {end_date})")
+        total_count += count
+
+    logger.success(f"交易日历同步完成，共 {total_count} 条")
     return True
 
 
@@ -149,8 +192,7 @@ def sync_stock_pool(
     count = repo.save(stocks)
 
     # 统计
-    st_count = sum(1 for s in stocks if s.is_st)
-    suspended_count = sum(1 for s in stocks if s.is_suspended)
+    st_count, suspended_count = repo.count_flags()
 
     logger.success(f"股票池同步完成: {count} 只 (ST: {st_count}, 停牌: {suspended_count})")
     return True
@@ -9,8 +9,10 @@ K线数据初始化
     retry_failed()  # 补充初始化失败的股票
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 
+import pandas as pd
 from loguru import logger
 
 from src.common.config import load_config
@@ -18,6 +20,11 @@ from src.data.repository.kline import KlineRepository
 from src.data.query.stock_query import StockQuery
 from src.data.source.juejin_client import JuejinClient
 
+# 补充初始化时每累积多少只股票写一次库
+RETRY_FLUSH_SIZE = 50
+# 补充初始化时并发下载的线程数
+RETRY_MAX_WORKERS = 8
+
 
 def show_status():
     """查看当前状态"""
@@ -30,27 +37,24 @@ def show_status():
     print("=" * 50)
 
     # 股票池状态
-    main_count = len(stock_query.get_symbols("main"))
-    gem_count = len(stock_query.get_symbols("gem"))
+    board_counts = stock_query.count_by_board()
+    main_count, gem_count = board_counts.get("main", 0), board_counts.get("gem", 0)
     total_target = main_count + gem_count
     print(f"\n目标股票: {total_target} 只 (主板 {main_count}, 创业板 {gem_count})")
 
     # 初始化状态
     is_completed = kline_repo.is_init_completed()
-    completed_count = kline_repo.get_symbol_count()
+    kline_count, symbol_count, completed_count = kline_repo.status_summary()
     print(f"已完成股票: {completed_count} 只")
     print(f"初始化状态: {'已完成' if is_completed else '未完成'}")
 
     # K线数据
-    kline_count = kline_repo.count()
-    symbol_count = kline_repo.count_symbols()
     print(f"\nK线记录数: {kline_count:,}")
     print(f"有数据股票: {symbol_count} 只")
 
     # 失败的股票
-    all_symbols = set(stock_query.get_symbols("main") + stock_query.get_symbols("gem"))
-    completed = kline_repo.get_completed_symbols()
-    failed = all_symbols - completed
+    all_symbols = stock_query.get_symbols_by_boards(["main", "gem"])
+    failed = kline_repo.get_pending_symbols(all_symbols)
     if failed:
         print(f"\n失败股票: {len(failed)} 只")
 
@@ -79,8 +83,7 @@ def init():
 
     # 检查股票池
     stock_query = StockQuery()
-    pool_count = len(stock_query.get_symbols())
-    if pool_count == 0:
+    if not stock_query.has_stocks():
         print("错误: 股票池为空！请先同步股票池")
         return
 
@@ -97,40 +100,78 @@ def retry_failed():
     client = JuejinClient(token=config.platform.juejin_token)
 
     # 获取失败的股票
-    all_symbols = set(stock_query.get_symbols("main") + stock_query.get_symbols("gem"))
-    completed = kline_repo.get_completed_symbols()
-    failed = sorted(all_symbols - completed)
+    all_symbols = stock_query.get_symbols_by_boards(["main", "gem"])
+    failed = kline_repo.get_pending_symbols(all_symbols)
 
     if not failed:
         print("没有失败的股票，无需补充")
         return
 
-    print(f"发现 {len(failed)} 只失败股票，开始补充初始化...")
+    n_failed = len(failed)
+    print(f"发现 {n_failed} 只失败股票，开始补充初始化...")
 
     # 初始化日期范围
     start = date(2023, 1, 1)
     end = date(2026, 1, 1)
 
     success_count = 0
-    for i, symbol in enumerate(failed):
-        logger.info(f"[{i+1}/{len(failed)}] {symbol} 开始...")
-
-        try:
-            total = 0
-            for df in client.get_kline([symbol], start, end, adjust="post"):
-                if df.empty:
-                    continue
-                if "pre_close" not in df.columns:
-                    df["pre_close"] = 0.0
-                total += kline_repo.save_kline(df)
-
-            kline_repo.mark_symbol_completed(symbol, end)
-            logger.info(f"[{i+1}/{len(failed)}] {symbol} 完成，{total} 条记录")
-            success_count += 1
-        except Exception as e:
-            logger.error(f"[{i+1}/{len(failed)}] {symbol} 失败: {e}")
-
-    print(f"\n补充完成: 成功 {success_count}, 失败 {len(failed) - success_count}")
+    pending_frames: list[pd.DataFrame] = []
+    pending_symbols: list[str] = []
+    # 网络拉取并发执行，写库仍在主线程串行完成
+    with ThreadPoolExecutor(max_workers=RETRY_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(_fetch_symbol_kline, client, symbol, start, end): symbol
+            for symbol in failed
+        }
+        for i, future in enumerate(as_completed(futures)):
+            symbol = futures[future]
+            prefix = f"[{i+1}/{n_failed}] {symbol}"
+            try:
+                pending_frames.extend(future.result())
+                pending_symbols.append(symbol)
+                logger.info(f"{prefix} 下载完成")
+            except Exception as e:
+                logger.error(f"{prefix} 失败: {e}")
+
+            if len(pending_symbols) >= RETRY_FLUSH_SIZE or i == n_failed - 1:
+                success_count += _flush_pending(kline_repo, pending_frames, pending_symbols, end)
+                pending_frames.clear()
+                pending_symbols.clear()
+
+    print(f"\n补充完成: 成功 {success_count}, 失败 {n_failed - success_count}")
+
+
+def _fetch_symbol_kline(
+    client: JuejinClient,
+    symbol: str,
+    start: date,
+    end: date,
+) -> list[pd.DataFrame]:
+    """下载单只股票全部K线分批结果"""
+    frames = []
+    for df in client.get_kline([symbol], start, end, adjust="post"):
+        if not df.empty:
+            frames.append(df)
+    return frames
+
+
+def _flush_pending(
+    kline_repo: KlineRepository,
+    frames: list[pd.DataFrame],
+    symbols: list[str],
+    end: date,
+) -> int:
+    """批量写入累积的K线并标记完成，返回成功的股票数"""
+    if not symbols:
+        return 0
+    try:
+        total = kline_repo.save_kline(pd.concat(frames, ignore_index=True)) if frames else 0
+        kline_repo.mark_symbols_completed(symbols, end)
+    except Exception as e:
+        logger.error(f"批量写入 {len(symbols)} 只股票失败: {e}")
+        return 0
+    logger.info(f"批量写入 {len(symbols)} 只股票，{total} 条记录")
+    return len(symbols)
 
 
 # ======================
@@ -9,6 +9,28 @@ import math
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba 为可选加速依赖，缺失时退化为纯 NumPy 实现
+    def njit(*_args, **_kwargs):
+        return lambda func: func
+
+
+# 价格比较容差，避免浮点数直接判等
+PRICE_EPSILON = 1e-8
+
+# 筹码量舍入的小数位数
+CHIP_ROUND_DECIMALS = 12
+
+# JIT 预热用的最小合成K线: [time, open, close, high, low, volume, amount, amplitude, turnover_rate]
+_WARMUP_KLINE = np.array([
+    [0, 10.0, 10.5, 11.0, 9.5, 1000, 10000, 15.0, 5.0],
+    [1, 10.5, 10.2, 10.8, 10.0, 1200, 12000, 7.6, 4.0],
+])
+
 
 @dataclass
 class ChipResult:
@@ -21,8 +43,89 @@ class ChipResult:
     price_range_70: tuple     # 70%筹码价格范围 (low, high)
 
 
+@njit(cache=True)
+def _accumulate_chips(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    avgs: np.ndarray,
+    g_heights: np.ndarray,
+    turnover_rates: np.ndarray,
+    l_idx: np.ndarray,
+    h_idx: np.ndarray,
+    bin_prices: np.ndarray,
+    min_price: float,
+    accuracy: float,
+) -> np.ndarray:
+    """
+    逐根K线累积筹码分布（numba 可用时 JIT 编译）
+
+    每根K线先按换手率衰减历史筹码，再把当日换手的筹码按三角分布
+    摊到 [low, high] 区间：三角面积为1，顶点位于均价处，
+    故顶点高度 g = 2 / (high - low)。
+
+    Parameters
+    ----------
+    highs, lows, avgs : np.ndarray
+        形状 (N,) 的最高价、最低价、均价 (open + close + high + low) / 4
+    g_heights : np.ndarray
+        形状 (N,) 的三角分布顶点高度，一字板为 accuracy_factor - 1
+    turnover_rates : np.ndarray
+        形状 (N,) 的换手率（小数，已截断到 [0, 1]）
+    l_idx, h_idx : np.ndarray
+        形状 (N,) 的各K线覆盖价格档位上下界，已裁剪到筹码数组范围内
+    bin_prices : np.ndarray
+        各价格档位对应的价格
+    min_price : float
+        最低价格（第0档）
+    accuracy : float
+        档位价格间隔
+
+    Returns
+    -------
+    np.ndarray
+        各价格档位上的筹码量
+
+    Notes
+    -----
+    复杂度 O(N * M)，N 为K线数，M 为价格档位数。
+    """
+    accuracy_factor = bin_prices.shape[0]
+    chips = np.zeros(accuracy_factor, dtype=np.float64)
+
+    for i in range(highs.shape[0]):
+        high, low, avg = highs[i], lows[i], avgs[i]
+        g_height, turnover_rate = g_heights[i], turnover_rates[i]
+
+        # 无换手（如缺少换手率数据）时既不衰减也不新增筹码
+        if turnover_rate <= 0:
+            continue
+
+        # 衰减历史筹码
+        chips *= (1 - turnover_rate)
+
+        if abs(high - low) < PRICE_EPSILON:
+            # 一字板：全部筹码集中在均价所在档位
+            g_idx = math.floor((avg - min_price) / accuracy)
+            if 0 <= g_idx < accuracy_factor:
+                chips[g_idx] += g_height * turnover_rate / 2
+            continue
+
+        l, h = l_idx[i], h_idx[i]
+        if l > h:
+            continue
+
+        # 上升沿 (p - low) / (avg - low)，下降沿 (high - p) / (high - avg)
+        # 分母趋近0时该侧退化为常数1
+        prices = bin_prices[l:h + 1]
+        up = (prices - low) / (avg - low) if abs(avg - low) >= PRICE_EPSILON else np.ones_like(prices)
+        down = (high - prices) / (high - avg) if abs(high - avg) >= PRICE_EPSILON else np.ones_like(prices)
+        chips[l:h + 1] += np.where(prices <= avg, up, down) * g_height * turnover_rate
+
+    return chips
+
+
 def calculate_chip(
-    kline: List[List],
+    kline: List[List] | np.ndarray,
     index: int = -1,
     accuracy_factor: int = 150,
     range_val: int = None,
@@ -32,8 +135,9 @@ def calculate_chip(
 
     Parameters
     ----------
-    kline : List[List]
+    kline : List[List] | np.ndarray
         K线数据，每行格式: [time, open, close, high, low, volume, amount, amplitude, turnover_rate]
+        传入形状 (N, 9) 的二维数组时直接按列切片，省去逐行转换；第0列（时间）不参与计算
     index : int
         计算到哪根K线，默认-1（最后一根）
     accuracy_factor : int
@@ -58,90 +162,66 @@ def calculate_chip(
     if len(calc_data) == 0:
         raise ValueError('K线数据为空')
 
-    # 2. 计算价格范围
-    max_price = calc_data[0][3]  # high
-    min_price = calc_data[0][4]  # low
-    for row in calc_data[1:]:
-        max_price = max(max_price, row[3])
-        min_price = min(min_price, row[4])
-
-    # 3. 计算精度
+    # 2. 提取价格列（开、收、高、低）与换手率（百分比转小数，上限1）
+    if isinstance(calc_data, np.ndarray):
+        ohlc = calc_data[:, 1:5].astype(np.float64)
+        raw_turnover = (
+            calc_data[:, 8].astype(np.float64) if calc_data.shape[1] > 8
+            else np.zeros(len(calc_data))
+        )
+    else:
+        ohlc = np.array([row[1:5] for row in calc_data], dtype=np.float64)
+        raw_turnover = np.array([row[8] if len(row) > 8 else 0 for row in calc_data], dtype=np.float64)
+    turnover_rates = np.minimum(raw_turnover / 100, 1)
+
+    # 3. 计算价格范围
+    max_price = float(ohlc[:, 2].max())
+    min_price = float(ohlc[:, 3].min())
+
+    # 4. 计算精度
     accuracy = max(0.01, (max_price - min_price) / (accuracy_factor - 1))
 
-    # 4. 初始化筹码分布数组
-    chips = [0.0] * accuracy_factor
-
-    # 5. 遍历K线计算筹码分布
-    for row in calc_data:
-        open_p, close, high, low = row[1], row[2], row[3], row[4]
-        turnover_rate = min(1, row[8] / 100) if len(row) > 8 else 0
-
-        # 平均价格
-        avg = (open_p + close + high + low) / 4
-
-        # 价格索引
-        h_idx = math.floor((high - min_price) / accuracy)
-        l_idx = math.ceil((low - min_price) / accuracy)
-
-        # G点坐标
-        if high == low:
-            g_point = [accuracy_factor - 1, math.floor((avg - min_price) / accuracy)]
-        else:
-            g_point = [2 / (high - low), math.floor((avg - min_price) / accuracy)]
+    # 5. 各价格档位
+    bin_prices = min_price + accuracy * np.arange(accuracy_factor)
+
+    # 6. 逐K线标量一次性向量化预计算：均价、三角顶点高度、覆盖的价格档位区间
+    highs, lows = ohlc[:, 2], ohlc[:, 3]
+    avgs = (ohlc[:, 0] + ohlc[:, 1] + highs + lows) / 4
+    is_flat = np.abs(highs - lows) < PRICE_EPSILON
+    with np.errstate(divide='ignore'):
+        g_heights = np.where(is_flat, accuracy_factor - 1, 2 / (highs - lows))
+    l_idx = np.maximum(np.ceil((lows - min_price) / accuracy), 0).astype(np.int64)
+    h_idx = np.minimum(np.floor((highs - min_price) / accuracy), accuracy_factor - 1).astype(np.int64)
+
+    # 7. 遍历K线计算筹码分布
+    chips = _accumulate_chips(
+        highs, lows, avgs, g_heights, turnover_rates,
+        l_idx, h_idx, bin_prices, min_price, accuracy,
+    )
 
-        # 衰减历史筹码
-        for n in range(len(chips)):
-            chips[n] *= (1 - turnover_rate)
-
-        # 三角分布计算
-        if high == low:
-            # 一字板：矩形分布
-            if 0 <= g_point[1] < len(chips):
-                chips[g_point[1]] += g_point[0] * turnover_rate / 2
-        else:
-            # 正常K线：三角分布
-            for j in range(l_idx, h_idx + 1):
-                if j >= len(chips) or j < 0:
-                    continue
-                cur_price = min_price + accuracy * j
-                if cur_price <= avg:
-                    if abs(avg - low) < 1e-8:
-                        chips[j] += g_point[0] * turnover_rate
-                    else:
-                        chips[j] += (cur_price - low) / (avg - low) * g_point[0] * turnover_rate
-                else:
-                    if abs(high - avg) < 1e-8:
-                        chips[j] += g_point[0] * turnover_rate
-                    else:
-                        chips[j] += (high - cur_price) / (high - avg) * g_point[0] * turnover_rate
-
-    # 6. 计算总筹码
-    total = sum(float(f"{c:.12g}") for c in chips)
+    # 8. 累计筹码（按价格档位升序），总筹码即累计末值
+    # 舍入消除浮点累积误差，避免分位点落在误差噪声上
+    chips = np.round(chips, CHIP_ROUND_DECIMALS)
+    cum_chips = np.cumsum(chips)
+    total = cum_chips[-1]
     if total == 0:
         raise ValueError('筹码总量为0')
 
-    # 7. 当前价格
-    current_price = kline[index][2]
+    # 9. 当前价格
+    current_price = float(kline[index][2])
 
-    # 8. 辅助函数：根据筹码量获取价格
+    # 10. 辅助函数：根据筹码量获取价格
+    # 累计筹码首次超过 chip_amount 的档位，二分查找 O(log N)
     def get_cost_by_chip(chip_amount):
-        s = 0.0
-        for i in range(accuracy_factor):
-            val = float(f"{chips[i]:.12g}")
-            if s + val > chip_amount:
-                return min_price + i * accuracy
-            s += val
-        return min_price + (accuracy_factor - 1) * accuracy
-
-    # 9. 计算获利比例
-    below = 0.0
-    for i in range(accuracy_factor):
-        val = float(f"{chips[i]:.12g}")
-        if current_price >= min_price + i * accuracy:
-            below += val
-    benefit_part = below / total
-
-    # 10. 计算百分比筹码
+        i = np.searchsorted(cum_chips, chip_amount, side='right')
+        return float(bin_prices[min(i, accuracy_factor - 1)])
+
+    # 11. 计算获利比例：价格不高于当前价的档位筹码之和
+    n_below = np.searchsorted(bin_prices, current_price, side='right')
+    below = cum_chips[n_below - 1] if n_below > 0 else 0.0
+    benefit_part = float(below / total)
+
+    # 12. 计算百分比筹码
     def compute_percent(percent):
         ps = [(1 - percent) / 2, (1 + percent) / 2]
         pr = [get_cost_by_chip(total * ps[0]), get_cost_by_chip(total * ps[1])]
@@ -154,7 +234,7 @@ def calculate_chip(
     range_90, conc_90 = compute_percent(0.9)
     range_70, conc_70 = compute_percent(0.7)
 
-    # 11. 平均成本
+    # 13. 平均成本
     avg_cost = get_cost_by_chip(total * 0.5)
 
     return ChipResult(
@@ -165,3 +245,8 @@ def calculate_chip(
         price_range_90=range_90,
         price_range_70=range_70,
     )
+
+
+def warmup_jit() -> None:
+    """用最小合成K线触发一次 JIT 编译（cache=True 时写入磁盘缓存），避免首次计算承担编译耗时"""
+    calculate_chip(_WARMUP_KLINE)
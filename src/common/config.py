@@ -4,14 +4,21 @@
 
 从YAML文件加载配置到dataclass，提供类型安全的访问。
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# 优先使用 libyaml 的 C 实现加速解析
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
+# DatabaseConfig 中需转换为 Path 的字段
+_PATH_FIELDS = ("daily_kline", "stock_meta", "realtime", "backtest")
+
+
+@dataclass(slots=True, frozen=True)
 class PlatformConfig:
     """平台配置"""
     juejin_token: str
@@ -20,7 +27,7 @@ class PlatformConfig:
     web_port: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DatabaseConfig:
     """数据库配置"""
     daily_kline: Path
@@ -28,14 +35,8 @@ class DatabaseConfig:
     realtime: Path
     backtest: Path
 
-    def __post_init__(self) -> None:
-        self.daily_kline = Path(self.daily_kline)
-        self.stock_meta = Path(self.stock_meta)
-        self.realtime = Path(self.realtime)
-        self.backtest = Path(self.backtest)
-
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StockPoolConfig:
     """股票池配置"""
     markets: list[str]
@@ -43,7 +44,7 @@ class StockPoolConfig:
     exclude_suspended: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingHoursConfig:
     """交易时段配置"""
     morning_start: str
@@ -52,7 +53,7 @@ class TradingHoursConfig:
     afternoon_end: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TechnicalIndicatorsConfig:
     """技术指标参数"""
     kdj_n: int
@@ -61,14 +62,14 @@ class TechnicalIndicatorsConfig:
     ma_periods: list[int]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpecialIndicatorsConfig:
     """特质指标参数"""
     chip_compare_yesterday: bool
     main_inflow_rate_min: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DailyDataConfig:
     """日常数据阈值"""
     turnover_rate_min: float
@@ -88,7 +89,7 @@ class DailyDataConfig:
     price_vwap_deviation_max: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConditionsConfig:
     """预警条件配置"""
     kdj_j_threshold: float
@@ -102,7 +103,7 @@ class ConditionsConfig:
     price_high_lookback_days: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetaConfig:
     """元信息"""
     generated_at: str
@@ -110,7 +111,7 @@ class MetaConfig:
     project: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     """应用主配置"""
     platform: PlatformConfig
@@ -128,6 +129,9 @@ def load_config(config_path: str | Path = "config/settings.yaml") -> AppConfig:
     """
     从YAML文件加载配置
 
+    按 (绝对路径, 修改时间) 缓存：文件未变时返回同一对象，
+    文件修改后下次调用自动重新解析。
+
     Parameters
     ----------
     config_path : str | Path
@@ -143,16 +147,28 @@ def load_config(config_path: str | Path = "config/settings.yaml") -> AppConfig:
     FileNotFoundError
         配置文件不存在
     """
-    path = Path(config_path)
-    if not path.exists():
-        raise FileNotFoundError(f"配置文件不存在: {path}")
+    path = Path(config_path).resolve()
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"配置文件不存在: {path}") from None
+    return _load_config_cached(path, mtime_ns)
+
 
+def invalidate_config_cache() -> None:
+    """清空配置缓存（测试或热加载用）"""
+    _load_config_cached.cache_clear()
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(path: Path, mtime_ns: int) -> AppConfig:
+    """按绝对路径与修改时间缓存的配置加载（mtime_ns 仅作为缓存键）"""
     with open(path, "r", encoding="utf-8") as f:
-        data: dict[str, Any] = yaml.safe_load(f)
+        data: dict[str, Any] = yaml.load(f, Loader=_YAML_LOADER)
 
     return AppConfig(
         platform=PlatformConfig(**data["platform"]),
-        database=DatabaseConfig(**data["database"]),
+        database=_database_config(data["database"]),
         stock_pool=StockPoolConfig(**data["stock_pool"]),
         trading_hours=TradingHoursConfig(**data["trading_hours"]),
         technical_indicators=TechnicalIndicatorsConfig(**data["technical_indicators"]),
@@ -161,3 +177,11 @@ def load_config(config_path: str | Path = "config/settings.yaml") -> AppConfig:
         conditions=ConditionsConfig(**data["conditions"]),
         meta=MetaConfig(**data["meta"]),
     )
+
+
+def _database_config(raw: dict[str, Any]) -> DatabaseConfig:
+    """构造数据库配置，路径字段统一转换为 Path，未知字段原样传入由 DatabaseConfig 报错"""
+    return DatabaseConfig(**{
+        key: Path(value) if key in _PATH_FIELDS and not isinstance(value, Path) else value
+        for key, value in raw.items()
+    })
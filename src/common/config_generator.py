@@ -4,21 +4,29 @@
 
 根据Schema生成带注释的YAML配置文件。
 """
+import os
 from pathlib import Path
 from datetime import datetime
-from io import StringIO
 
-try:
-    from ruamel.yaml import YAML
-    from ruamel.yaml.comments import CommentedMap
-except ImportError:
-    print("错误: 缺少 ruamel.yaml 库，请安装: pip install ruamel.yaml")
-    raise
+import yaml
 
-from src.common.config_schema import CONFIG_SCHEMA, SECTION_NAMES
+from src.common.config_schema import CONFIG_SCHEMA, SECTION_DEFAULTS, SECTION_NAMES
 
+# 优先使用 libyaml 的 C 实现加速输出（配置只含基本类型，使用安全 Dumper）
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
-def build_config_section(schema: dict, overrides: dict = None) -> CommentedMap:
+# 输出行宽上限
+_YAML_LINE_WIDTH = 4096
+
+# 分隔线与各分区标题注释，导入时按Schema一次性生成
+_RULE = '# ' + '=' * 62 + '\n'
+_SECTION_BANNERS = {
+    key: f"{_RULE}# {SECTION_NAMES.get(key, key)}\n{_RULE}"
+    for key in CONFIG_SCHEMA
+}
+
+
+def build_config_section(schema: dict, overrides: dict = None) -> dict:
     """
     根据Schema生成单个配置块
 
@@ -31,20 +39,21 @@ def build_config_section(schema: dict, overrides: dict = None) -> CommentedMap:
 
     Returns
     -------
-    CommentedMap
-        带注释的配置字典
+    dict
+        配置字典（注释在保存时由Schema补充）
     """
-    section = CommentedMap()
-    overrides = overrides or {}
+    defaults = {key: default for key, (default, _) in schema.items()}
+    return _apply_overrides(defaults, overrides)
 
-    for key, (default_value, comment) in schema.items():
-        section[key] = overrides.get(key, default_value)
-        section.yaml_add_eol_comment(comment, key)
 
-    return section
+def _apply_overrides(defaults: dict, overrides: dict = None) -> dict:
+    """以默认值为底复制配置块，仅覆盖默认值中已有的键"""
+    if not overrides:
+        return dict(defaults)
+    return {key: overrides.get(key, value) for key, value in defaults.items()}
 
 
-def generate_config(overrides: dict = None) -> CommentedMap:
+def generate_config(overrides: dict = None) -> dict:
     """
     生成完整配置
 
@@ -55,62 +64,75 @@ def generate_config(overrides: dict = None) -> CommentedMap:
 
     Returns
     -------
-    CommentedMap
+    dict
         完整配置字典
     """
     overrides = overrides or {}
-    config = CommentedMap()
+    config = {}
 
     # 自动填充生成时间
     if 'meta' not in overrides:
         overrides['meta'] = {}
     overrides['meta']['generated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # 遍历Schema生成各配置块
-    for section_name, section_schema in CONFIG_SCHEMA.items():
-        section_overrides = overrides.get(section_name, {})
-        config[section_name] = build_config_section(section_schema, section_overrides)
+    # 基于预生成的默认值快照生成各配置块
+    for section_name, defaults in SECTION_DEFAULTS.items():
+        config[section_name] = _apply_overrides(defaults, overrides.get(section_name))
 
     return config
 
 
-def save_config(config: CommentedMap, output_path: Path) -> None:
+def _dump_section(section_key: str, section: dict) -> str:
+    """
+    输出单个配置块，注释取自Schema并追加在每个配置项首行末尾
+
+    放宽行宽限制，避免长字符串（如Webhook）被折行后注释错位。
+    """
+    schema = CONFIG_SCHEMA[section_key]
+    lines = [f"{section_key}:"]
+    for key, value in section.items():
+        item_lines = yaml.dump(
+            {key: value},
+            Dumper=_YAML_DUMPER,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=_YAML_LINE_WIDTH,
+        ).splitlines()
+        lines.append(f"  {item_lines[0]}  # {schema[key][1]}")
+        lines.extend(f"  {line}" for line in item_lines[1:])
+    return "\n".join(lines) + "\n"
+
+
+def save_config(config: dict, output_path: Path) -> None:
     """
     保存配置到YAML文件
 
     Parameters
     ----------
-    config : CommentedMap
+    config : dict
         配置字典
     output_path : Path
         输出文件路径
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    yaml = YAML()
-    yaml.default_flow_style = False
-    yaml.preserve_quotes = True
-    yaml.indent(mapping=2, sequence=2, offset=0)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # 文件头
-        f.write('# ' + '=' * 62 + '\n')
-        f.write('# A股预警系统配置文件\n')
-        f.write(f'# 生成时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n')
-        f.write('# ' + '=' * 62 + '\n\n')
-
-        # 写入各模块
-        for section_key in CONFIG_SCHEMA.keys():
-            f.write('# ' + '=' * 62 + '\n')
-            f.write(f'# {SECTION_NAMES.get(section_key, section_key)}\n')
-            f.write('# ' + '=' * 62 + '\n')
-
-            temp_config = CommentedMap()
-            temp_config[section_key] = config[section_key]
-
-            string_stream = StringIO()
-            yaml.dump(temp_config, string_stream)
-            f.write(string_stream.getvalue() + '\n')
+    # 文件头 + 各模块，拼接后一次写入
+    header = (
+        f'{_RULE}# A股预警系统配置文件\n'
+        f'# 生成时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n{_RULE}\n'
+    )
+    sections = (
+        _SECTION_BANNERS[key] + _dump_section(key, config[key]) + '\n'
+        for key in CONFIG_SCHEMA
+    )
+    content = (header + ''.join(sections)).encode('utf-8')
+
+    # 内容未变化时跳过写入；否则先写临时文件再原子替换，避免写到一半留下残缺配置
+    if output_path.exists() and output_path.read_bytes() == content:
+        return
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, output_path)
 
 
 def main() -> None:
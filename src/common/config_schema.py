@@ -134,3 +134,9 @@ SECTION_NAMES = {
     'conditions': '预警条件配置',
     'meta': '元信息',
 }
+
+# 各分区默认值快照 {section: {key: default_value}}，导入时一次性生成
+SECTION_DEFAULTS = {
+    section: {key: default for key, (default, _) in schema.items()}
+    for section, schema in CONFIG_SCHEMA.items()
+}
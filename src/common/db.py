@@ -5,20 +5,65 @@
 提供 DuckDB 数据库连接管理。
 """
 
+import atexit
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import ClassVar, Iterable, Iterator
 
 import duckdb
 from duckdb import DuckDBPyConnection
 
 from src.common.config import AppConfig
 
+# 进程内常驻连接 {数据库文件绝对路径: 连接}，DatabaseManager 与各数据仓库共享，
+# 同一数据库文件在进程内只打开一次
+_CONN_CACHE: dict[str, DuckDBPyConnection] = {}
+
+
+def get_shared_connection(key: str) -> DuckDBPyConnection:
+    """
+    获取数据库的常驻连接（首次访问时打开）
+
+    Parameters
+    ----------
+    key : str
+        数据库文件绝对路径，或 ":memory:"
+
+    Returns
+    -------
+    DuckDBPyConnection
+        常驻连接，调用方应基于它创建游标使用，不要直接关闭
+    """
+    conn = _CONN_CACHE.get(key)
+    if conn is None:
+        conn = duckdb.connect(key)
+        _CONN_CACHE[key] = conn
+    return conn
+
+
+@atexit.register
+def close_shared_connections(keys: Iterable[str] | None = None) -> None:
+    """
+    关闭常驻连接（进程退出时自动关闭全部）
+
+    Parameters
+    ----------
+    keys : Iterable[str] | None
+        要关闭的数据库键，None 表示全部；之后再次访问会重新打开
+    """
+    for key in list(_CONN_CACHE) if keys is None else keys:
+        conn = _CONN_CACHE.pop(key, None)
+        if conn is not None:
+            conn.close()
+
 
 class DatabaseManager:
     """
     DuckDB 数据库连接管理器
 
+    每个数据库只打开一次底层连接并常驻（与数据仓库共用同一连接缓存），进程退出时统一关闭；
+    每次 get_connection 基于常驻连接创建独立游标，可安全用于多线程。
+
     管理四个数据库：
     - daily_kline: 日K线数据
     - stock_meta: 股票元信息
@@ -35,6 +80,9 @@ class DatabaseManager:
     # 有效的数据库名称
     VALID_DB_NAMES = ("daily_kline", "stock_meta", "realtime", "backtest")
 
+    # 进程内已确认存在的数据目录，避免每次构造都重复 mkdir
+    _dirs_ready: ClassVar[set[Path]] = set()
+
     def __init__(self, config: AppConfig) -> None:
         """
         初始化
@@ -48,10 +96,12 @@ class DatabaseManager:
         self._ensure_data_dirs()
 
     def _ensure_data_dirs(self) -> None:
-        """确保数据目录存在"""
+        """确保数据目录存在（同一目录每个进程只创建一次）"""
         for db_name in self.VALID_DB_NAMES:
-            db_path = getattr(self.config.database, db_name)
-            db_path.parent.mkdir(parents=True, exist_ok=True)
+            data_dir = getattr(self.config.database, db_name).parent
+            if data_dir not in self._dirs_ready:
+                data_dir.mkdir(parents=True, exist_ok=True)
+                self._dirs_ready.add(data_dir)
 
     @contextmanager
     def get_connection(self, db_name: str) -> Iterator[DuckDBPyConnection]:
@@ -66,14 +116,22 @@ class DatabaseManager:
         Yields
         ------
         DuckDBPyConnection
-            DuckDB 连接对象
+            基于常驻连接的游标，退出上下文时关闭游标（不关闭底层连接）
         """
         if db_name not in self.VALID_DB_NAMES:
             raise ValueError(f"无效的数据库名称: {db_name}，有效值: {self.VALID_DB_NAMES}")
 
-        db_path = getattr(self.config.database, db_name)
-        conn = duckdb.connect(str(db_path))
+        conn = get_shared_connection(self._conn_key(db_name))
+        cursor = conn.cursor()
         try:
-            yield conn
+            yield cursor
         finally:
-            conn.close()
+            cursor.close()
+
+    def _conn_key(self, db_name: str) -> str:
+        """数据库在常驻连接缓存中的键（文件绝对路径）"""
+        return str(getattr(self.config.database, db_name).resolve())
+
+    def close_all(self) -> None:
+        """关闭本管理器四个数据库的常驻连接"""
+        close_shared_connections(self._conn_key(name) for name in self.VALID_DB_NAMES)
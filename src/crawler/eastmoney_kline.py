@@ -5,11 +5,25 @@
 获取历史K线数据。
 """
 
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
 import httpx
-from typing import List
+import numpy as np
+import pandas as pd
 
 from src.utils.symbol_utils import to_eastmoney_code
 
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选加速依赖，缺失时使用 httpx 自带的标准库 json 解析
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # 请求头
 _HEADERS = {
@@ -19,6 +33,13 @@ _HEADERS = {
     'Referer': 'http://quote.eastmoney.com/center/gridlist.html',
 }
 
+# 请求超时（秒）
+REQUEST_TIMEOUT = 10
+# 批量获取时的并发线程数
+MAX_WORKERS = 16
+# 连接池上限（保持长连接，复用 TCP/TLS 握手）
+MAX_CONNECTIONS = 32
+
 # K线类型映射
 KLT_MAP = {
     'daily': '101',    # 日K
@@ -31,6 +52,29 @@ KLT_MAP = {
 }
 
 
+# 进程内共享的 HTTP 客户端，首次请求时创建（加锁避免并发首次请求重复创建）
+_CLIENT_LOCK = threading.Lock()
+_CLIENT: httpx.Client | None = None
+
+
+def _get_client() -> httpx.Client:
+    """获取共享 HTTP 客户端（线程安全，可跨线程复用连接池）"""
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = httpx.Client(
+                headers=_HEADERS,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                ),
+            )
+    return _CLIENT
+
+
 def get_kline(
     code: str,
     klt: str = 'daily',
@@ -73,28 +117,70 @@ def get_kline(
 
     url = 'https://push2his.eastmoney.com/api/qt/stock/kline/get'
 
-    resp = httpx.get(url, params=params, headers=_HEADERS, timeout=10)
-    data = resp.json()
+    resp = _get_client().get(url, params=params)
+    data = orjson.loads(resp.content) if orjson is not None else resp.json()
 
     if not data.get('data') or not data['data'].get('klines'):
         return []
 
-    # 解析K线数据
-    result = []
-    for line in data['data']['klines']:
-        parts = line.split(',')
-        # [time, open, close, high, low, volume, amount, amplitude, turnover_rate]
-        row = [
-            parts[0],                    # 时间
-            float(parts[1]),             # 开盘价
-            float(parts[2]),             # 收盘价
-            float(parts[3]),             # 最高价
-            float(parts[4]),             # 最低价
-            float(parts[5]),             # 成交量
-            float(parts[6]),             # 成交额
-            float(parts[7]),             # 振幅
-            float(parts[10]) if len(parts) > 10 else 0,  # 换手率
-        ]
-        result.append(row)
+    # 解析K线数据：整体交给 pandas 的 C 解析器，避免逐行 split + float
+    # 每行字段: 时间, 开盘, 收盘, 最高, 最低, 成交量, 成交额, 振幅, 涨跌幅, 涨跌额, 换手率
+    frame = pd.read_csv(
+        io.StringIO('\n'.join(data['data']['klines'])),
+        header=None,
+        dtype={0: str},
+    )
+    times = frame[0].tolist()
+    values = frame.iloc[:, 1:8].to_numpy(dtype=np.float64).tolist()
+    turnover = (
+        frame[10].to_numpy(dtype=np.float64) if frame.shape[1] > 10 else np.zeros(len(frame))
+    ).tolist()
+
+    # [time, open, close, high, low, volume, amount, amplitude, turnover_rate]
+    return [[t, *v, tr] for t, v, tr in zip(times, values, turnover)]
+
+
+def get_kline_many(
+    codes: List[str],
+    klt: str = 'daily',
+    limit: int = 200,
+    end_date: str = None,
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, List[List]]:
+    """
+    并发获取多只股票K线数据
+
+    请求在线程池中并发发出，共享同一连接池。单只股票请求失败只记录日志并跳过，
+    不影响其他股票的结果。
 
+    Parameters
+    ----------
+    codes : List[str]
+        股票代码列表，如 ['000001', '600000']
+    klt : str
+        K线类型，同 get_kline
+    limit : int
+        每只股票获取条数，默认200
+    end_date : str, optional
+        结束日期，如 '20260129'，默认最新
+    max_workers : int
+        并发线程数
+
+    Returns
+    -------
+    Dict[str, List[List]]
+        {股票代码: K线数据}，K线格式同 get_kline；请求失败的股票不在结果中
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            code: executor.submit(get_kline, code, klt, limit, end_date)
+            for code in codes
+        }
+
+    result = {}
+    for code, future in futures.items():
+        try:
+            result[code] = future.result()
+        except Exception as e:
+            logger.warning(f"获取K线失败 {code}: {e}")
     return result
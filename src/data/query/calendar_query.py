@@ -10,14 +10,21 @@
     is_td = q.is_trading_day("SHSE", "2024-01-15")
 """
 
-import pandas as pd
+import datetime
+
+import numpy as np
 
 from src.common.config import load_config
 from src.data.repository.trading_calendar import TradingCalendarRepository
 
 
 class CalendarQuery:
-    """交易日历查询"""
+    """
+    交易日历查询
+
+    交易日数组直接复用仓库的进程内缓存（同一数据库共享，任一仓库实例写入时失效），
+    单日查询均在内存中二分查找，结果以 "YYYY-MM-DD" 字符串返回。
+    """
 
     def __init__(self, repo: TradingCalendarRepository | None = None) -> None:
         if repo is None:
@@ -25,6 +32,10 @@ class CalendarQuery:
             repo = TradingCalendarRepository(config.database.stock_meta)
         self._repo = repo
 
+    def _get_days(self, exchange: str) -> np.ndarray:
+        """获取交易所全部交易日的升序 datetime64[D] 只读数组"""
+        return self._repo.get_trading_day_array(exchange)
+
     def get_trading_days(self, exchange: str, start: str, end: str) -> list[str]:
         """
         获取指定范围内的交易日
@@ -43,15 +54,10 @@ class CalendarQuery:
         list[str]
             交易日列表，格式 "YYYY-MM-DD"
         """
-        df = self._repo.query(
-            "SELECT date FROM trading_calendar "
-            "WHERE exchange = ? AND date >= ? AND date <= ? AND is_trading_day = true "
-            "ORDER BY date",
-            (exchange, start, end)
-        )
-        if df.empty:
-            return []
-        return [self._date_to_str(d) for d in df["date"].tolist()]
+        days = self._get_days(exchange)
+        lo = np.searchsorted(days, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(days, np.datetime64(end, "D"), side="right")
+        return self._days_to_str(days[lo:hi])
 
     def get_prev_trading_day(self, exchange: str, date: str) -> str | None:
         """
@@ -62,22 +68,16 @@ class CalendarQuery:
         exchange : str
             交易所代码
         date : str
-            日期
+            日期，格式 "YYYY-MM-DD"
 
         Returns
         -------
         str | None
             前一交易日，无则返回 None
         """
-        df = self._repo.query(
-            "SELECT date FROM trading_calendar "
-            "WHERE exchange = ? AND date < ? AND is_trading_day = true "
-            "ORDER BY date DESC LIMIT 1",
-            (exchange, date)
-        )
-        if df.empty:
-            return None
-        return self._date_to_str(df["date"].iloc[0])
+        days = self._get_days(exchange)
+        i = np.searchsorted(days, np.datetime64(date, "D"), side="left")
+        return str(days[i - 1]) if i > 0 else None
 
     def get_next_trading_day(self, exchange: str, date: str) -> str | None:
         """
@@ -88,22 +88,16 @@ class CalendarQuery:
         exchange : str
             交易所代码
         date : str
-            日期
+            日期，格式 "YYYY-MM-DD"
 
         Returns
         -------
         str | None
             下一交易日，无则返回 None
         """
-        df = self._repo.query(
-            "SELECT date FROM trading_calendar "
-            "WHERE exchange = ? AND date > ? AND is_trading_day = true "
-            "ORDER BY date ASC LIMIT 1",
-            (exchange, date)
-        )
-        if df.empty:
-            return None
-        return self._date_to_str(df["date"].iloc[0])
+        days = self._get_days(exchange)
+        i = np.searchsorted(days, np.datetime64(date, "D"), side="right")
+        return str(days[i]) if i < len(days) else None
 
     def is_trading_day(self, exchange: str, date: str) -> bool:
         """
@@ -114,21 +108,17 @@ class CalendarQuery:
         exchange : str
             交易所代码
         date : str
-            日期
+            日期，格式 "YYYY-MM-DD"
 
         Returns
         -------
         bool
             是否为交易日
         """
-        df = self._repo.query(
-            "SELECT is_trading_day FROM trading_calendar "
-            "WHERE exchange = ? AND date = ?",
-            (exchange, date)
-        )
-        if df.empty:
-            return False
-        return bool(df["is_trading_day"].iloc[0])
+        days = self._get_days(exchange)
+        target = np.datetime64(date, "D")
+        i = np.searchsorted(days, target, side="left")
+        return bool(i < len(days) and days[i] == target)
 
     def get_all_trading_days(self, exchange: str) -> list[str]:
         """
@@ -144,15 +134,7 @@ class CalendarQuery:
         list[str]
             全部交易日列表
         """
-        df = self._repo.query(
-            "SELECT date FROM trading_calendar "
-            "WHERE exchange = ? AND is_trading_day = true "
-            "ORDER BY date",
-            (exchange,)
-        )
-        if df.empty:
-            return []
-        return [self._date_to_str(d) for d in df["date"].tolist()]
+        return self._days_to_str(self._get_days(exchange))
 
     def get_date_range(self, exchange: str) -> tuple[str | None, str | None]:
         """
@@ -163,17 +145,17 @@ class CalendarQuery:
         tuple[str | None, str | None]
             (最早日期, 最晚日期)，无数据返回 (None, None)
         """
-        df = self._repo.query(
-            "SELECT MIN(date) as min_date, MAX(date) as max_date "
-            "FROM trading_calendar WHERE exchange = ?",
-            (exchange,)
-        )
-        if df.empty or pd.isna(df["min_date"].iloc[0]):
+        min_date, max_date = self._repo.get_date_range(exchange)
+        if min_date is None:
             return None, None
-        return self._date_to_str(df["min_date"].iloc[0]), self._date_to_str(df["max_date"].iloc[0])
+        return self._date_to_str(min_date), self._date_to_str(max_date)
+
+    def _days_to_str(self, days: np.ndarray) -> list[str]:
+        """datetime64[D] 数组整体格式化为字符串列表"""
+        return np.datetime_as_string(days, unit="D").tolist()
 
     def _date_to_str(self, d) -> str:
         """日期转字符串"""
-        if hasattr(d, 'strftime'):
+        if isinstance(d, datetime.date):
             return d.strftime("%Y-%m-%d")
         return str(d)[:10]
@@ -10,6 +10,8 @@ K线数据查询
     df = q.get_kline_by_date("2024-01-15")
 """
 
+from typing import Iterator
+
 import pandas as pd
 
 from src.common.config import load_config
@@ -73,16 +75,64 @@ class KlineQuery:
         if not symbols:
             return pd.DataFrame()
 
-        placeholders = ",".join(["?"] * len(symbols))
-        sql = f"""
+        # 代码列表作为单个数组参数传入，半连接过滤，避免拼接大量占位符
+        sql = """
+        SELECT * FROM daily_kline
+        WHERE symbol IN (SELECT unnest(?::VARCHAR[]))
+          AND date >= ?
+          AND date <= ?
+        ORDER BY symbol, date
+        """
+        return self._repo.query(sql, (list(symbols), start, end))
+
+    def iter_kline_multi(
+        self,
+        symbols: list[str],
+        start: str,
+        end: str,
+    ) -> Iterator[tuple[str, pd.DataFrame]]:
+        """
+        逐只股票流式返回区间K线
+
+        结果按股票、日期排序后分块读取，每凑齐一只股票即产出，
+        内存中只保留当前块，无需物化全部股票的K线。
+
+        Parameters
+        ----------
+        symbols : list[str]
+            股票代码列表
+        start : str
+            开始日期
+        end : str
+            结束日期
+
+        Yields
+        ------
+        tuple[str, pd.DataFrame]
+            (股票代码, 该股票K线，按日期升序)
+        """
+        if not symbols:
+            return
+
+        sql = """
         SELECT * FROM daily_kline
-        WHERE symbol IN ({placeholders})
+        WHERE symbol IN (SELECT unnest(?::VARCHAR[]))
           AND date >= ?
           AND date <= ?
         ORDER BY symbol, date
         """
-        params = tuple(symbols) + (start, end)
-        return self._repo.query(sql, params)
+        pending = None
+        for chunk in self._repo.query_chunks(sql, (list(symbols), start, end)):
+            if pending is not None:
+                chunk = pd.concat([pending, chunk], ignore_index=True)
+            # 块末尾的股票可能延续到下一块，暂存到下一轮
+            is_last = chunk["symbol"] == chunk["symbol"].iloc[-1]
+            pending = chunk[is_last]
+            for symbol, group in chunk[~is_last].groupby("symbol", sort=False):
+                yield symbol, group.reset_index(drop=True)
+
+        if pending is not None:
+            yield pending["symbol"].iloc[0], pending.reset_index(drop=True)
 
     def get_kline_by_date(self, date: str) -> pd.DataFrame:
         """
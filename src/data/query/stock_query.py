@@ -77,13 +77,39 @@ class StockQuery:
             板块，None 表示全部
         """
         if board:
-            df = self._repo.query(
+            return self._repo.query_column(
                 "SELECT symbol FROM stock_pool WHERE board = ?",
                 (board,)
             )
-        else:
-            df = self._repo.query("SELECT symbol FROM stock_pool")
-        return df["symbol"].tolist() if not df.empty else []
+        return self._repo.query_column("SELECT symbol FROM stock_pool")
+
+    def has_stocks(self) -> bool:
+        """股票池是否非空（读到一行即返回，不做全表计数）"""
+        return bool(self._repo.query_column("SELECT 1 FROM stock_pool LIMIT 1"))
+
+    def get_symbols_by_boards(self, boards: list[str]) -> list[str]:
+        """
+        获取多个板块的股票代码（单次查询，按代码排序）
+
+        Parameters
+        ----------
+        boards : list[str]
+            板块列表，如 ["main", "gem"]
+        """
+        if not boards:
+            return []
+        placeholders = ",".join(["?"] * len(boards))
+        return self._repo.query_column(
+            f"SELECT symbol FROM stock_pool WHERE board IN ({placeholders}) ORDER BY symbol",
+            tuple(boards)
+        )
+
+    def count_by_board(self) -> dict[str, int]:
+        """按板块统计股票数量 {board: count}"""
+        df = self._repo.query(
+            "SELECT board, COUNT(*) AS cnt FROM stock_pool GROUP BY board"
+        )
+        return dict(zip(df["board"], df["cnt"].astype(int))) if not df.empty else {}
 
     def get_stock(self, symbol: str) -> StockInfo | None:
         """
@@ -102,31 +128,5 @@ class StockQuery:
         return stocks[0] if stocks else None
 
     def _df_to_stocks(self, df: pd.DataFrame) -> list[StockInfo]:
-        """DataFrame 转 StockInfo 列表"""
-        if df.empty:
-            return []
-        result = []
-        for _, row in df.iterrows():
-            listed = row.get("listed_date")
-            if pd.isna(listed):
-                listed_date = None
-            elif hasattr(listed, 'date'):
-                listed_date = listed.date()
-            else:
-                listed_date = listed
-
-            result.append(StockInfo(
-                symbol=row["symbol"],
-                code=row["code"],
-                exchange=row["exchange"],
-                name=row["name"],
-                board=row["board"],
-                is_st=bool(row["is_st"]),
-                is_suspended=bool(row["is_suspended"]),
-                listed_date=listed_date,
-                pre_close=float(row.get("pre_close", 0) or 0),
-                upper_limit=float(row.get("upper_limit", 0) or 0),
-                lower_limit=float(row.get("lower_limit", 0) or 0),
-                adj_factor=float(row.get("adj_factor", 1) or 1),
-            ))
-        return result
+        """DataFrame 转 StockInfo 列表（复用仓库的批量转换）"""
+        return self._repo._df_to_stocks(df)
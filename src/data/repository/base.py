@@ -7,14 +7,24 @@
 
 import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
+from typing import Iterator
 
-import duckdb
 import pandas as pd
 from duckdb import DuckDBPyConnection
 
+from src.common.db import get_shared_connection
+
 logger = logging.getLogger(__name__)
 
+# 流式查询每块包含的 DuckDB 向量数（每个向量 2048 行）
+QUERY_CHUNK_VECTORS = 50
+
+# DuckDB 内存数据库路径（不落盘，进程内共享同一个内存库）
+MEMORY_DB = ":memory:"
+
 
 class BaseRepository(ABC):
     """
@@ -41,13 +51,43 @@ class BaseRepository(ABC):
         self._ensure_db_dir()
         self._ensure_table()
 
+    @classmethod
+    def in_memory(cls) -> "BaseRepository":
+        """创建基于内存数据库的仓库（测试用，无磁盘 I/O）"""
+        return cls(Path(MEMORY_DB))
+
+    @property
+    def _is_memory(self) -> bool:
+        return str(self._db_path) == MEMORY_DB
+
+    @cached_property
+    def _db_key(self) -> str:
+        """数据库标识（文件绝对路径或 ":memory:"），同一数据库的所有仓库实例相同"""
+        return MEMORY_DB if self._is_memory else str(self._db_path.resolve())
+
     def _ensure_db_dir(self) -> None:
         """确保数据库目录存在"""
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._is_memory:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def _get_connection(self) -> DuckDBPyConnection:
-        """获取数据库连接"""
-        return duckdb.connect(str(self._db_path))
+    @contextmanager
+    def _get_connection(self) -> Iterator[DuckDBPyConnection]:
+        """
+        获取数据库连接（上下文管理器）
+
+        同一数据库文件只打开一次底层连接（与 DatabaseManager 共用 src.common.db 的连接缓存），
+        每次调用基于它创建独立游标，退出上下文时只关闭游标。
+
+        Yields
+        ------
+        DuckDBPyConnection
+            基于常驻连接的游标
+        """
+        cursor = get_shared_connection(self._db_key).cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
 
     @abstractmethod
     def _create_table_sql(self) -> str:
@@ -106,6 +146,77 @@ class BaseRepository(ABC):
                 return conn.execute(sql, params).df()
             return conn.execute(sql).df()
 
+    def query_chunks(
+        self,
+        sql: str,
+        params: tuple | None = None,
+        vectors_per_chunk: int = QUERY_CHUNK_VECTORS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        流式查询，按块返回DataFrame（不一次性物化全部结果）
+
+        Parameters
+        ----------
+        sql : str
+            SQL语句
+        params : tuple, optional
+            参数
+        vectors_per_chunk : int
+            每块包含的 DuckDB 向量数（每个向量 2048 行）
+
+        Yields
+        ------
+        pd.DataFrame
+            结果块，顺序与查询结果一致
+        """
+        with self._get_connection() as conn:
+            result = conn.execute(sql, params) if params else conn.execute(sql)
+            while True:
+                chunk = result.fetch_df_chunk(vectors_per_chunk)
+                if chunk.empty:
+                    return
+                yield chunk
+
+    def query_column(self, sql: str, params: tuple | None = None) -> list:
+        """
+        查询单列并直接返回列表（不构造DataFrame）
+
+        Parameters
+        ----------
+        sql : str
+            SQL语句，取结果的第一列
+        params : tuple, optional
+            参数
+
+        Returns
+        -------
+        list
+            第一列的值
+        """
+        with self._get_connection() as conn:
+            result = conn.execute(sql, params) if params else conn.execute(sql)
+            return [row[0] for row in result.fetchall()]
+
+    def query_row(self, sql: str, params: tuple | None = None) -> tuple | None:
+        """
+        查询并返回首行（不构造DataFrame，DATE 列直接为 datetime.date）
+
+        Parameters
+        ----------
+        sql : str
+            SQL语句
+        params : tuple, optional
+            参数
+
+        Returns
+        -------
+        tuple | None
+            首行的值，无结果返回 None
+        """
+        with self._get_connection() as conn:
+            result = conn.execute(sql, params) if params else conn.execute(sql)
+            return result.fetchone()
+
     def insert_df(self, df: pd.DataFrame, mode: str = "append") -> int:
         """
         插入DataFrame数据
@@ -126,12 +237,17 @@ class BaseRepository(ABC):
             return 0
 
         with self._get_connection() as conn:
-            if mode == "replace":
-                conn.execute(f"DELETE FROM {self.TABLE_NAME}")
-
-            conn.register("_tmp_df", df)
-            conn.execute(f"INSERT INTO {self.TABLE_NAME} SELECT * FROM _tmp_df")
-            conn.unregister("_tmp_df")
+            # 删除与写入放在同一事务，替换模式下不会留下空表
+            conn.begin()
+            try:
+                if mode == "replace":
+                    conn.execute(f"DELETE FROM {self.TABLE_NAME}")
+                # append 直接按列位置扫描 DataFrame，无需注册临时视图和拼接 SQL
+                conn.append(self.TABLE_NAME, df)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
         logger.debug(f"插入 {len(df)} 行到 {self.TABLE_NAME}")
         return len(df)
@@ -141,6 +257,10 @@ class BaseRepository(ABC):
         df = self.query(f"SELECT COUNT(*) as cnt FROM {self.TABLE_NAME}")
         return int(df["cnt"].iloc[0])
 
+    def checkpoint(self) -> None:
+        """将 WAL 合并进数据库文件（批量写入后调用，整理行组）"""
+        self.execute("CHECKPOINT")
+
     def truncate(self) -> None:
         """清空表"""
         self.execute(f"DELETE FROM {self.TABLE_NAME}")
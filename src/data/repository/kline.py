@@ -12,6 +12,9 @@ import pandas as pd
 
 from src.data.repository.base import BaseRepository
 
+# 价格列（DOUBLE 存储；后复权价可远超 2048 元，float32 会丢失精度）
+PRICE_COLUMNS = ("open", "high", "low", "close", "pre_close")
+
 
 class KlineRepository(BaseRepository):
     """
@@ -97,16 +100,11 @@ class KlineRepository(BaseRepository):
 
     def get_last_sync_date(self) -> date | None:
         """获取最后同步日期（增量更新用）"""
-        df = self.query(
+        row = self.query_row(
             f"SELECT sync_end_date FROM {self.META_TABLE} WHERE table_name = ?",
             (self.TABLE_NAME,)
         )
-        if df.empty or pd.isna(df["sync_end_date"].iloc[0]):
-            return None
-        val = df["sync_end_date"].iloc[0]
-        if hasattr(val, 'date'):
-            return val.date()
-        return val
+        return row[0] if row else None
 
     def update_sync_date(self, end_date: date) -> None:
         """更新同步日期"""
@@ -119,21 +117,43 @@ class KlineRepository(BaseRepository):
 
     # ========== 股票同步状态（断点续传） ==========
 
-    def get_completed_symbols(self) -> set[str]:
-        """获取已完成同步的股票代码"""
-        df = self.query(
+    def get_completed_symbols(self) -> frozenset[str]:
+        """获取已完成同步的股票代码（只读集合）"""
+        return frozenset(self.query_column(
             f"SELECT symbol FROM {self.STATUS_TABLE} WHERE status = 'completed'"
+        ))
+
+    def get_pending_symbols(self, symbols: list[str]) -> list[str]:
+        """
+        获取给定股票中尚未完成同步的股票（按代码排序）
+
+        在数据库内用 EXCEPT 求差集，避免在 Python 侧构造集合。
+        """
+        if not symbols:
+            return []
+        return self.query_column(
+            f"SELECT unnest(?::VARCHAR[]) AS symbol "
+            f"EXCEPT SELECT symbol FROM {self.STATUS_TABLE} WHERE status = 'completed' "
+            f"ORDER BY symbol",
+            (symbols,)
         )
-        return set(df["symbol"].tolist()) if not df.empty else set()
 
     def mark_symbol_completed(self, symbol: str, last_date: date) -> None:
         """标记股票同步完成"""
+        self.mark_symbols_completed([symbol], last_date)
+
+    def mark_symbols_completed(self, symbols: list[str], last_date: date) -> None:
+        """批量标记股票同步完成（单连接 executemany）"""
+        if not symbols:
+            return
         sql = """
         INSERT OR REPLACE INTO kline_sync_status
         (symbol, status, last_date, updated_at)
         VALUES (?, 'completed', ?, ?)
         """
-        self.execute(sql, (symbol, last_date, datetime.now()))
+        now = datetime.now()
+        with self._get_connection() as conn:
+            conn.executemany(sql, [(symbol, last_date, now) for symbol in symbols])
 
     def get_symbol_count(self) -> int:
         """获取已同步股票数量"""
@@ -156,20 +176,47 @@ class KlineRepository(BaseRepository):
         ----------
         df : pd.DataFrame
             包含列: symbol, date, open, high, low, close, volume, amount, pre_close
+            缺少 pre_close 时按 0.0 补齐（不修改传入的 df）
 
         Returns
         -------
         int
             保存的记录数
+
+        Notes
+        -----
+        先删除与本批 (股票, 日期) 键相同的已有数据再整批写入，
+        库中其他日期的数据不受影响；通过 DuckDB 直接扫描 DataFrame，不逐行插入。
         """
         if df.empty:
             return 0
 
-        # 确保列顺序
+        if "pre_close" not in df.columns:
+            df = df.assign(pre_close=0.0)
+
+        # 确保列顺序，并按 (date, symbol) 排序写入，
+        # 使 DuckDB 行组的日期 min/max 统计更紧凑，按日期查询可跳过更多行组
         cols = ["symbol", "date", "open", "high", "low", "close", "volume", "amount", "pre_close"]
-        df = df[[c for c in cols if c in df.columns]]
+        df = df[[c for c in cols if c in df.columns]].sort_values(["date", "symbol"], kind="mergesort")
 
-        return self.insert_df(df, mode="replace")
+        # 只替换本批中出现的 (股票, 日期) 键，删除与写入在同一事务内完成
+        delete_sql = f"""
+        DELETE FROM {self.TABLE_NAME} AS t
+        USING _kline_keys AS k
+        WHERE t.symbol = k.symbol AND t.date = k.date::DATE
+        """
+        with self._get_connection() as conn:
+            conn.begin()
+            try:
+                conn.register("_kline_keys", df[["symbol", "date"]])
+                conn.execute(delete_sql)
+                conn.unregister("_kline_keys")
+                conn.append(self.TABLE_NAME, df)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return len(df)
 
     def get_kline(
         self,
@@ -197,36 +244,53 @@ class KlineRepository(BaseRepository):
         if isinstance(symbols, str):
             symbols = [symbols]
 
-        placeholders = ",".join(["?"] * len(symbols))
+        # 代码列表作为单个数组参数传入，半连接过滤，避免拼接大量占位符
         sql = f"""
         SELECT * FROM {self.TABLE_NAME}
-        WHERE symbol IN ({placeholders})
+        WHERE symbol IN (SELECT unnest(?::VARCHAR[]))
           AND date >= ?
           AND date <= ?
         ORDER BY symbol, date
         """
-        params = tuple(symbols) + (start_date, end_date)
-        return self.query(sql, params)
+        return self.query(sql, (list(symbols), start_date, end_date))
 
     def get_latest_date(self, symbol: str) -> date | None:
         """获取某只股票最新K线日期"""
-        df = self.query(
-            f"SELECT MAX(date) as max_date FROM {self.TABLE_NAME} WHERE symbol = ?",
+        row = self.query_row(
+            f"SELECT MAX(date) FROM {self.TABLE_NAME} WHERE symbol = ?",
             (symbol,)
         )
-        if df.empty or pd.isna(df["max_date"].iloc[0]):
-            return None
-        val = df["max_date"].iloc[0]
-        if hasattr(val, 'date'):
-            return val.date()
-        return val
+        return row[0]
 
     def count(self) -> int:
         """获取K线记录总数"""
         df = self.query(f"SELECT COUNT(*) as cnt FROM {self.TABLE_NAME}")
         return int(df["cnt"].iloc[0]) if not df.empty else 0
 
+    def status_summary(self) -> tuple[int, int, int]:
+        """
+        单次查询汇总同步状态
+
+        Returns
+        -------
+        tuple[int, int, int]
+            (K线记录数, 有K线数据的股票数, 已完成同步的股票数)
+        """
+        df = self.query(f"""
+        SELECT
+            (SELECT COUNT(*) FROM {self.TABLE_NAME}) AS kline_count,
+            (SELECT COUNT(DISTINCT symbol) FROM {self.TABLE_NAME}) AS symbol_count,
+            (SELECT COUNT(*) FROM {self.STATUS_TABLE} WHERE status = 'completed') AS completed_count
+        """)
+        row = df.iloc[0]
+        return int(row["kline_count"]), int(row["symbol_count"]), int(row["completed_count"])
+
     def count_symbols(self) -> int:
         """获取有K线数据的股票数量"""
         df = self.query(f"SELECT COUNT(DISTINCT symbol) as cnt FROM {self.TABLE_NAME}")
         return int(df["cnt"].iloc[0]) if not df.empty else 0
+
+    def count_symbols_approx(self) -> int:
+        """获取有K线数据的股票数量（HyperLogLog 近似值，仅用于日志等展示场景）"""
+        df = self.query(f"SELECT approx_count_distinct(symbol) as cnt FROM {self.TABLE_NAME}")
+        return int(df["cnt"].iloc[0]) if not df.empty else 0
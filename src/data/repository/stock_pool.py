@@ -5,7 +5,9 @@
 存储和查询股票基本信息。
 """
 
+from dataclasses import fields
 from datetime import datetime, timedelta
+from operator import attrgetter
 from pathlib import Path
 
 import pandas as pd
@@ -13,6 +15,12 @@ import pandas as pd
 from src.data.repository.base import BaseRepository
 from src.data.types import StockInfo
 
+# StockInfo 字段名（与 stock_pool 表前 12 列顺序一致）
+STOCK_FIELDS = tuple(f.name for f in fields(StockInfo))
+
+# board 列的取值（ENUM 存储，每行1字节，等值过滤按整数比较）
+BOARD_VALUES = ("main", "gem", "star", "bse", "unknown")
+
 
 class StockPoolRepository(BaseRepository):
     """
@@ -27,15 +35,20 @@ class StockPoolRepository(BaseRepository):
     def __init__(self, db_path: Path) -> None:
         super().__init__(db_path)
         self._ensure_meta_table()
+        # 上次同步时间的实例内缓存，写入元信息时同步更新
+        self._last_sync_at: datetime | None = None
+        self._last_sync_loaded = False
 
     def _create_table_sql(self) -> str:
-        return """
+        board_values = ", ".join(f"'{b}'" for b in BOARD_VALUES)
+        return f"""
+        CREATE TYPE IF NOT EXISTS board_enum AS ENUM ({board_values});
         CREATE TABLE IF NOT EXISTS stock_pool (
             symbol VARCHAR PRIMARY KEY,
             code VARCHAR,
             exchange VARCHAR,
             name VARCHAR,
-            board VARCHAR,
+            board board_enum,
             is_st BOOLEAN,
             is_suspended BOOLEAN,
             listed_date DATE,
@@ -63,13 +76,14 @@ class StockPoolRepository(BaseRepository):
 
     def get_last_sync_time(self) -> datetime | None:
         """获取上次同步时间"""
-        df = self.query(
-            f"SELECT last_sync_at FROM {self.META_TABLE} WHERE table_name = ?",
-            (self.TABLE_NAME,)
-        )
-        if df.empty or pd.isna(df["last_sync_at"].iloc[0]):
-            return None
-        return pd.to_datetime(df["last_sync_at"].iloc[0]).to_pydatetime()
+        if not self._last_sync_loaded:
+            row = self.query_row(
+                f"SELECT last_sync_at FROM {self.META_TABLE} WHERE table_name = ?",
+                (self.TABLE_NAME,)
+            )
+            self._last_sync_at = row[0] if row else None
+            self._last_sync_loaded = True
+        return self._last_sync_at
 
     def needs_sync(self, max_age_hours: int = 23) -> bool:
         """判断是否需要同步（默认23小时）"""
@@ -79,14 +93,15 @@ class StockPoolRepository(BaseRepository):
         age = datetime.now() - last_sync
         return age > timedelta(hours=max_age_hours)
 
-    def _update_sync_meta(self, count: int) -> None:
-        """更新同步元信息"""
+    def _update_sync_meta(self, count: int, now: datetime) -> None:
+        """更新同步元信息（同步时间与本次写入的 updated_at 一致）"""
         sql = """
         INSERT OR REPLACE INTO sync_meta
         (table_name, last_sync_at, record_count)
         VALUES (?, ?, ?)
         """
-        self.execute(sql, (self.TABLE_NAME, datetime.now(), count))
+        self.execute(sql, (self.TABLE_NAME, now, count))
+        self._last_sync_at, self._last_sync_loaded = now, True
 
     def save(self, stocks: list[StockInfo]) -> int:
         """
@@ -105,28 +120,13 @@ class StockPoolRepository(BaseRepository):
         if not stocks:
             return 0
 
+        # 按列构造 DataFrame（列顺序与表结构一致），避免逐行构造字典
+        columns = zip(*map(attrgetter(*STOCK_FIELDS), stocks))
+        df = pd.DataFrame(dict(zip(STOCK_FIELDS, columns)))
         now = datetime.now()
-        records = [
-            {
-                "symbol": s.symbol,
-                "code": s.code,
-                "exchange": s.exchange,
-                "name": s.name,
-                "board": s.board,
-                "is_st": s.is_st,
-                "is_suspended": s.is_suspended,
-                "listed_date": s.listed_date,
-                "pre_close": s.pre_close,
-                "upper_limit": s.upper_limit,
-                "lower_limit": s.lower_limit,
-                "adj_factor": s.adj_factor,
-                "updated_at": now,
-            }
-            for s in stocks
-        ]
-        df = pd.DataFrame(records)
+        df["updated_at"] = now
         count = self.insert_df(df, mode="replace")
-        self._update_sync_meta(count)
+        self._update_sync_meta(count, now)
         return count
 
     def get_all(self) -> list[StockInfo]:
@@ -134,6 +134,14 @@ class StockPoolRepository(BaseRepository):
         df = self.query(f"SELECT * FROM {self.TABLE_NAME}")
         return self._df_to_stocks(df)
 
+    def get_sample(self, n: int) -> list[StockInfo]:
+        """获取按代码排序的前 n 只股票（仅转换这 n 行，用于展示样例）"""
+        df = self.query(
+            f"SELECT * FROM {self.TABLE_NAME} ORDER BY symbol LIMIT ?",
+            (n,)
+        )
+        return self._df_to_stocks(df)
+
     def get_by_board(self, board: str) -> list[StockInfo]:
         """按板块获取股票"""
         df = self.query(
@@ -166,41 +174,58 @@ class StockPoolRepository(BaseRepository):
     def get_symbols(self, board: str | None = None) -> list[str]:
         """获取股票代码列表"""
         if board:
-            df = self.query(
+            return self.query_column(
                 f"SELECT symbol FROM {self.TABLE_NAME} WHERE board = ?",
                 (board,)
             )
-        else:
-            df = self.query(f"SELECT symbol FROM {self.TABLE_NAME}")
-        return df["symbol"].tolist() if not df.empty else []
+        return self.query_column(f"SELECT symbol FROM {self.TABLE_NAME}")
+
+    def count_flags(self) -> tuple[int, int]:
+        """统计 ST 与停牌股票数量，返回 (st_count, suspended_count)"""
+        df = self.query(
+            f"SELECT COUNT(*) FILTER (WHERE is_st) AS st, "
+            f"COUNT(*) FILTER (WHERE is_suspended) AS suspended FROM {self.TABLE_NAME}"
+        )
+        return int(df["st"].iloc[0]), int(df["suspended"].iloc[0])
+
+    def board_stats(self) -> pd.DataFrame:
+        """
+        按板块一次性统计股票数、ST 数与停牌数
+
+        Returns
+        -------
+        pd.DataFrame
+            以 board 为索引，列: total, st, suspended
+        """
+        df = self.query(
+            f"SELECT board::VARCHAR AS board, COUNT(*) AS total, "
+            f"COUNT(*) FILTER (WHERE is_st) AS st, "
+            f"COUNT(*) FILTER (WHERE is_suspended) AS suspended "
+            f"FROM {self.TABLE_NAME} GROUP BY board"
+        )
+        return df.set_index("board")
 
     def _df_to_stocks(self, df: pd.DataFrame) -> list[StockInfo]:
-        """DataFrame 转 StockInfo 列表"""
+        """DataFrame 转 StockInfo 列表（按列批量转换，避免逐行构造 Series）"""
         if df.empty:
             return []
-        result = []
-        for _, row in df.iterrows():
-            # 处理日期
-            listed = row.get("listed_date")
-            if pd.isna(listed):
-                listed_date = None
-            elif hasattr(listed, 'date'):
-                listed_date = listed.date()
-            else:
-                listed_date = listed
-
-            result.append(StockInfo(
-                symbol=row["symbol"],
-                code=row["code"],
-                exchange=row["exchange"],
-                name=row["name"],
-                board=row["board"],
-                is_st=bool(row["is_st"]),
-                is_suspended=bool(row["is_suspended"]),
-                listed_date=listed_date,
-                pre_close=float(row.get("pre_close", 0) or 0),
-                upper_limit=float(row.get("upper_limit", 0) or 0),
-                lower_limit=float(row.get("lower_limit", 0) or 0),
-                adj_factor=float(row.get("adj_factor", 1) or 1),
-            ))
-        return result
+
+        # 上市日期：NaT 转为 None
+        listed = pd.to_datetime(df["listed_date"], errors="coerce")
+        listed_dates = listed.dt.date.astype(object).where(listed.notna(), None)
+
+        # 数值列：缺失按默认值填充，复权因子为0时同样视为1
+        prices = [
+            pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+            for col in ("pre_close", "upper_limit", "lower_limit")
+        ]
+        adj_factor = pd.to_numeric(df["adj_factor"], errors="coerce").fillna(1.0)
+        adj_factor = adj_factor.mask(adj_factor == 0, 1.0)
+
+        # 列顺序与 StockInfo 字段顺序一致
+        columns = [
+            df["symbol"], df["code"], df["exchange"], df["name"], df["board"],
+            df["is_st"].astype(bool), df["is_suspended"].astype(bool),
+            listed_dates, *prices, adj_factor,
+        ]
+        return [StockInfo(*row) for row in zip(*(col.tolist() for col in columns))]
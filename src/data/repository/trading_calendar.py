@@ -6,13 +6,26 @@
 """
 
 from datetime import date, datetime, timedelta
+from operator import attrgetter
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from src.data.repository.base import BaseRepository
 from src.data.types import TradingDay, TradingCalendarColumns
 
+# 入库字段（TradingDay 属性名与表列名一致）
+CALENDAR_FIELDS = tuple(TradingCalendarColumns.ALL)
+
+# exchange 列的取值（ENUM 存储，每行1字节，等值过滤按整数比较）
+EXCHANGE_VALUES = ("SHSE", "SZSE")
+
+# 各交易所交易日数组与日历日期范围（含非交易日）的进程内缓存 {(数据库标识, 交易所): 值}，
+# 同一数据库的所有仓库实例共享，任一实例 save / truncate 时失效
+_DAYS_CACHE: dict[tuple[str, str], np.ndarray] = {}
+_RANGE_CACHE: dict[tuple[str, str], tuple[date | None, date | None]] = {}
+
 
 class TradingCalendarRepository(BaseRepository):
     """
@@ -37,11 +50,16 @@ class TradingCalendarRepository(BaseRepository):
     def __init__(self, db_path: Path) -> None:
         super().__init__(db_path)
         self._ensure_meta_table()
+        # 上次同步时间的实例内缓存，写入元信息时同步更新
+        self._last_sync_at: datetime | None = None
+        self._last_sync_loaded = False
 
     def _create_table_sql(self) -> str:
-        return """
+        exchange_values = ", ".join(f"'{e}'" for e in EXCHANGE_VALUES)
+        return f"""
+        CREATE TYPE IF NOT EXISTS exchange_enum AS ENUM ({exchange_values});
         CREATE TABLE IF NOT EXISTS trading_calendar (
-            exchange VARCHAR NOT NULL,
+            exchange exchange_enum NOT NULL,
             date DATE NOT NULL,
             is_trading_day BOOLEAN NOT NULL,
             prev_trading_day DATE,
@@ -73,13 +91,14 @@ class TradingCalendarRepository(BaseRepository):
         datetime | None
             上次同步时间，从未同步返回 None
         """
-        df = self.query(
-            f"SELECT last_sync_at FROM {self.META_TABLE} WHERE table_name = ?",
-            (self.TABLE_NAME,)
-        )
-        if df.empty or pd.isna(df["last_sync_at"].iloc[0]):
-            return None
-        return pd.to_datetime(df["last_sync_at"].iloc[0]).to_pydatetime()
+        if not self._last_sync_loaded:
+            row = self.query_row(
+                f"SELECT last_sync_at FROM {self.META_TABLE} WHERE table_name = ?",
+                (self.TABLE_NAME,)
+            )
+            self._last_sync_at = row[0] if row else None
+            self._last_sync_loaded = True
+        return self._last_sync_at
 
     def needs_sync(self, max_age_days: int = 30) -> bool:
         """
@@ -108,13 +127,15 @@ class TradingCalendarRepository(BaseRepository):
         (table_name, last_sync_at, sync_start_date, sync_end_date, record_count)
         VALUES (?, ?, ?, ?, ?)
         """
+        now = datetime.now()
         self.execute(sql, (
             self.TABLE_NAME,
-            datetime.now(),
+            now,
             start_date,
             end_date,
             count,
         ))
+        self._last_sync_at, self._last_sync_loaded = now, True
 
     def save(self, trading_days: list[TradingDay]) -> int:
         """
@@ -133,42 +154,61 @@ class TradingCalendarRepository(BaseRepository):
         if not trading_days:
             return 0
 
-        # 转换为 DataFrame
-        records = [
-            {
-                TradingCalendarColumns.EXCHANGE: td.exchange,
-                TradingCalendarColumns.DATE: td.date,
-                TradingCalendarColumns.IS_TRADING_DAY: td.is_trading_day,
-                TradingCalendarColumns.PREV_TRADING_DAY: td.prev_trading_day,
-                TradingCalendarColumns.NEXT_TRADING_DAY: td.next_trading_day,
-            }
-            for td in trading_days
-        ]
-        df = pd.DataFrame(records)
-
-        # 按 exchange + date 去重（保留最新）
-        with self._get_connection() as conn:
-            # 删除已存在的日期范围数据
-            exchange = trading_days[0].exchange
-            min_date = min(td.date for td in trading_days)
-            max_date = max(td.date for td in trading_days)
-
-            conn.execute(
-                f"DELETE FROM {self.TABLE_NAME} "
-                f"WHERE exchange = ? AND date >= ? AND date <= ?",
-                (exchange, min_date, max_date)
-            )
+        # 按列构造 DataFrame，避免逐行构造字典
+        columns = zip(*map(attrgetter(*CALENDAR_FIELDS), trading_days))
+        df = pd.DataFrame(dict(zip(CALENDAR_FIELDS, columns)))
 
-            # 插入新数据
-            conn.register("_tmp_df", df)
-            conn.execute(f"INSERT INTO {self.TABLE_NAME} SELECT * FROM _tmp_df")
-            conn.unregister("_tmp_df")
+        exchange = trading_days[0].exchange
+        min_date = df[TradingCalendarColumns.DATE].min()
+        max_date = df[TradingCalendarColumns.DATE].max()
+        column_list = ", ".join(CALENDAR_FIELDS)
 
-        # 更新元信息
-        self._update_sync_meta(min_date, max_date, len(df))
+        # 删除已存在的日期范围数据后按显式列名插入，同一事务内完成
+        with self._get_connection() as conn:
+            conn.begin()
+            try:
+                conn.execute(
+                    f"DELETE FROM {self.TABLE_NAME} "
+                    f"WHERE exchange = ? AND date >= ? AND date <= ?",
+                    (exchange, min_date, max_date)
+                )
+                conn.register("_tmp_df", df)
+                conn.execute(
+                    f"INSERT INTO {self.TABLE_NAME} ({column_list}) "
+                    f"SELECT {column_list} FROM _tmp_df"
+                )
+                conn.unregister("_tmp_df")
+                # 增量写入只覆盖近期窗口，元信息的起始日期取库中最早日期
+                table_start = conn.execute(f"SELECT MIN(date) FROM {self.TABLE_NAME}").fetchone()[0]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        # 交易日与日期范围缓存失效，更新元信息
+        _DAYS_CACHE.pop((self._db_key, exchange), None)
+        _RANGE_CACHE.pop((self._db_key, exchange), None)
+        self._update_sync_meta(table_start, max_date, len(df))
 
         return len(df)
 
+    def _trading_days(self, exchange: str) -> np.ndarray:
+        """获取交易所全部交易日的升序数组（datetime64[D]），首次访问时查库并缓存"""
+        key = (self._db_key, exchange)
+        days = _DAYS_CACHE.get(key)
+        if days is None:
+            days = np.array(
+                self.query_column(
+                    f"SELECT date FROM {self.TABLE_NAME} "
+                    f"WHERE exchange = ? AND is_trading_day = true "
+                    f"ORDER BY date",
+                    (exchange,)
+                ),
+                dtype="datetime64[D]",
+            )
+            _DAYS_CACHE[key] = days
+        return days
+
     def get_trading_days(
         self,
         exchange: str,
@@ -192,52 +232,52 @@ class TradingCalendarRepository(BaseRepository):
         list[date]
             交易日列表（已排序）
         """
-        df = self.query(
-            f"SELECT date FROM {self.TABLE_NAME} "
-            f"WHERE exchange = ? AND date >= ? AND date <= ? AND is_trading_day = true "
-            f"ORDER BY date",
-            (exchange, start_date, end_date)
-        )
-        if df.empty:
-            return []
-        return [d.date() if hasattr(d, 'date') else d for d in df["date"].tolist()]
+        days = self._trading_days(exchange)
+        lo = np.searchsorted(days, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(days, np.datetime64(end_date, "D"), side="right")
+        return days[lo:hi].tolist()
 
     def get_prev_trading_day(self, exchange: str, dt: date) -> date | None:
         """获取指定日期的前一交易日"""
-        df = self.query(
-            f"SELECT date FROM {self.TABLE_NAME} "
-            f"WHERE exchange = ? AND date < ? AND is_trading_day = true "
-            f"ORDER BY date DESC LIMIT 1",
-            (exchange, dt)
-        )
-        if df.empty:
-            return None
-        d = df["date"].iloc[0]
-        return d.date() if hasattr(d, 'date') else d
+        days = self._trading_days(exchange)
+        i = np.searchsorted(days, np.datetime64(dt, "D"), side="left")
+        return days[i - 1].item() if i > 0 else None
 
     def get_next_trading_day(self, exchange: str, dt: date) -> date | None:
         """获取指定日期的下一交易日"""
-        df = self.query(
-            f"SELECT date FROM {self.TABLE_NAME} "
-            f"WHERE exchange = ? AND date > ? AND is_trading_day = true "
-            f"ORDER BY date ASC LIMIT 1",
-            (exchange, dt)
-        )
-        if df.empty:
-            return None
-        d = df["date"].iloc[0]
-        return d.date() if hasattr(d, 'date') else d
+        days = self._trading_days(exchange)
+        i = np.searchsorted(days, np.datetime64(dt, "D"), side="right")
+        return days[i].item() if i < len(days) else None
 
     def is_trading_day(self, exchange: str, dt: date) -> bool:
         """判断是否为交易日"""
-        df = self.query(
-            f"SELECT is_trading_day FROM {self.TABLE_NAME} "
-            f"WHERE exchange = ? AND date = ?",
-            (exchange, dt)
-        )
-        if df.empty:
-            return False
-        return bool(df["is_trading_day"].iloc[0])
+        days = self._trading_days(exchange)
+        target = np.datetime64(dt, "D")
+        i = np.searchsorted(days, target, side="left")
+        return bool(i < len(days) and days[i] == target)
+
+    def is_trading_day_batch(self, exchange: str, dates) -> np.ndarray:
+        """
+        批量判断是否为交易日（向量化二分查找）
+
+        Parameters
+        ----------
+        exchange : str
+            交易所代码
+        dates : array-like
+            待判断日期序列（date / datetime64 / DatetimeIndex 均可）
+
+        Returns
+        -------
+        np.ndarray
+            与 dates 等长的布尔数组
+        """
+        days = self._trading_days(exchange)
+        targets = np.asarray(dates, dtype="datetime64[D]")
+        if days.size == 0:
+            return np.zeros(targets.shape, dtype=bool)
+        i = np.minimum(np.searchsorted(days, targets, side="left"), len(days) - 1)
+        return days[i] == targets
 
     def get_all_trading_days(self, exchange: str) -> list[date]:
         """
@@ -253,15 +293,25 @@ class TradingCalendarRepository(BaseRepository):
         list[date]
             全部交易日列表（已排序）
         """
-        df = self.query(
-            f"SELECT date FROM {self.TABLE_NAME} "
-            f"WHERE exchange = ? AND is_trading_day = true "
-            f"ORDER BY date",
-            (exchange,)
-        )
-        if df.empty:
-            return []
-        return [d.date() if hasattr(d, 'date') else d for d in df["date"].tolist()]
+        return self._trading_days(exchange).tolist()
+
+    def get_trading_day_array(self, exchange: str) -> np.ndarray:
+        """
+        获取数据库中全部交易日（数组形式，不构造 date 对象）
+
+        Parameters
+        ----------
+        exchange : str
+            交易所代码
+
+        Returns
+        -------
+        np.ndarray
+            升序 datetime64[D] 只读数组（与内部缓存共享内存）
+        """
+        view = self._trading_days(exchange).view()
+        view.flags.writeable = False
+        return view
 
     def get_date_range(self, exchange: str) -> tuple[date | None, date | None]:
         """
@@ -272,16 +322,19 @@ class TradingCalendarRepository(BaseRepository):
         tuple[date | None, date | None]
             (最早日期, 最晚日期)，无数据返回 (None, None)
         """
-        df = self.query(
-            f"SELECT MIN(date) as min_date, MAX(date) as max_date "
-            f"FROM {self.TABLE_NAME} WHERE exchange = ?",
-            (exchange,)
-        )
-        if df.empty or pd.isna(df["min_date"].iloc[0]):
-            return None, None
-
-        min_d = df["min_date"].iloc[0]
-        max_d = df["max_date"].iloc[0]
-        min_date = min_d.date() if hasattr(min_d, 'date') else min_d
-        max_date = max_d.date() if hasattr(max_d, 'date') else max_d
-        return min_date, max_date
+        key = (self._db_key, exchange)
+        date_range = _RANGE_CACHE.get(key)
+        if date_range is None:
+            date_range = self.query_row(
+                f"SELECT MIN(date), MAX(date) FROM {self.TABLE_NAME} WHERE exchange = ?",
+                (exchange,)
+            )
+            _RANGE_CACHE[key] = date_range
+        return date_range
+
+    def truncate(self) -> None:
+        """清空表并使本数据库的交易日缓存失效"""
+        super().truncate()
+        for cache in (_DAYS_CACHE, _RANGE_CACHE):
+            for key in [key for key in cache if key[0] == self._db_key]:
+                del cache[key]
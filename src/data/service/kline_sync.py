@@ -5,8 +5,10 @@ K线同步服务
 支持断点续传的初始化和增量更新。
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
+import pandas as pd
 from loguru import logger
 
 from src.common.config import load_config
@@ -31,6 +33,9 @@ class KlineSyncService:
     # 目标板块
     TARGET_BOARDS = ["main", "gem"]
 
+    # 初始化时并发下载的批次数（唯一的并发层；每批恰为一次掘金请求，写库仍在主线程串行完成）
+    INIT_MAX_WORKERS = 8
+
     def __init__(
         self,
         juejin_client: JuejinClient,
@@ -43,16 +48,13 @@ class KlineSyncService:
 
     def get_target_symbols(self) -> list[str]:
         """获取目标股票列表（主板+创业板，按代码排序）"""
-        symbols = []
-        for board in self.TARGET_BOARDS:
-            symbols.extend(self._stock_query.get_symbols(board))
-        return sorted(set(symbols))
+        return self._stock_query.get_symbols_by_boards(self.TARGET_BOARDS)
 
     def init_sync(self) -> None:
         """
         初始化同步（支持断点续传）
 
-        从2023-01-01同步到2026-01-01，逐只股票下载。
+        从2023-01-01同步到2026-01-01，按批下载。
         中断后重新运行会自动跳过已完成的股票。
         """
         # 检查是否已完成
@@ -69,64 +71,77 @@ class KlineSyncService:
             logger.error("股票池为空，请先同步股票池")
             return
 
-        # 获取已完成的股票
-        completed = self._kline_repo.get_completed_symbols()
-        remaining = [s for s in all_symbols if s not in completed]
+        # 未完成的股票（在库内做差集）
+        remaining = self._kline_repo.get_pending_symbols(all_symbols)
+        done_count = len(all_symbols) - len(remaining)
 
-        logger.info(f"初始化同步: 总计 {len(all_symbols)} 只, 已完成 {len(completed)}, 剩余 {len(remaining)}")
+        logger.info(f"初始化同步: 总计 {len(all_symbols)} 只, 已完成 {done_count}, 剩余 {len(remaining)}")
 
         if not remaining:
             self._kline_repo.set_init_status("init_completed")
             logger.info("全部完成!")
             return
 
-        # 逐只同步
-        for i, symbol in enumerate(remaining):
-            current = len(completed) + i + 1
-            logger.info(f"[{current}/{len(all_symbols)}] {symbol} 开始...")
-
-            try:
-                self._sync_single_stock(symbol, self.INIT_START, self.INIT_END)
-                self._kline_repo.mark_symbol_completed(symbol, self.INIT_END)
-                logger.info(f"[{current}/{len(all_symbols)}] {symbol} 完成")
-            except Exception as e:
-                logger.error(f"[{current}/{len(all_symbols)}] {symbol} 失败: {e}")
-                # 继续下一只，不中断
+        # 按批同步
+        self._sync_remaining(remaining, done_count, len(all_symbols))
 
         # 检查是否全部完成
-        final_completed = self._kline_repo.get_completed_symbols()
-        if len(final_completed) >= len(all_symbols):
+        final_count = self._kline_repo.get_symbol_count()
+        if final_count >= len(all_symbols):
             self._kline_repo.set_init_status("init_completed")
             self._kline_repo.update_sync_date(self.INIT_END)
+            self._kline_repo.checkpoint()
             logger.info("初始化全部完成!")
         else:
-            failed_count = len(all_symbols) - len(final_completed)
+            failed_count = len(all_symbols) - final_count
             logger.warning(f"初始化完成，但有 {failed_count} 只股票失败")
 
-    def _sync_single_stock(self, symbol: str, start: date, end: date) -> int:
+    def _sync_remaining(self, remaining: list[str], done_count: int, total: int) -> None:
+        """
+        按批同步剩余股票：多线程并发下载，主线程逐批写库并写入完成标记
+
+        某批失败只跳过该批，不中断后续批次。
+        """
+        # 每批股票数由初始化日期跨度与单次请求行数上限推导，保证一批只发一次请求
+        batch_size = self._client.kline_batch_size(self.INIT_START, self.INIT_END)
+        batches = [
+            remaining[i : i + batch_size]
+            for i in range(0, len(remaining), batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.INIT_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._fetch_symbols, batch, self.INIT_START, self.INIT_END): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                batch_range = f"{batch[0]} ~ {batch[-1]}"
+                try:
+                    df = future.result()
+                    count = self._kline_repo.save_kline(df) if df is not None else 0
+                    self._kline_repo.mark_symbols_completed(batch, self.INIT_END)
+                except Exception as e:
+                    # 失败批次不计入进度，继续下一批，不中断
+                    logger.error(f"[{done_count}/{total}] {batch_range} 失败: {e}")
+                    continue
+                done_count += len(batch)
+                logger.info(f"[{done_count}/{total}] {batch_range} 完成，{count} 条记录")
+
+    def _fetch_symbols(self, symbols: list[str], start: date, end: date) -> pd.DataFrame | None:
         """
-        同步单只股票K线
+        下载一批股票K线并合并（频率限制与临时错误由 JuejinClient._retry_call 退避重试）
 
         Returns
         -------
-        int
-            保存的记录数
+        pd.DataFrame | None
+            合并后的K线，无数据返回 None
         """
-        total_count = 0
-
-        # get_kline 返回迭代器（分批）
-        for df in self._client.get_kline([symbol], start, end, adjust="post"):
-            if df.empty:
-                continue
-
-            # 确保有 pre_close 列
-            if "pre_close" not in df.columns:
-                df["pre_close"] = 0.0
-
-            count = self._kline_repo.save_kline(df)
-            total_count += count
-
-        return total_count
+        # get_kline 返回迭代器（分批），各批合并为一个 DataFrame
+        frames = [
+            df for df in self._client.get_kline(symbols, start, end, adjust="post")
+            if not df.empty
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else None
 
     def incremental_sync(self) -> None:
         """
@@ -157,18 +172,13 @@ class KlineSyncService:
             logger.error("股票池为空")
             return
 
-        # 分批下载
-        total_count = 0
-        for df in self._client.get_kline(symbols, start, today, adjust="post"):
-            if df.empty:
-                continue
-            if "pre_close" not in df.columns:
-                df["pre_close"] = 0.0
-            count = self._kline_repo.save_kline(df)
-            total_count += count
+        # 分批下载，合并后一次写入
+        df = self._fetch_symbols(symbols, start, today)
+        total_count = self._kline_repo.save_kline(df) if df is not None else 0
 
         # 更新同步日期
         self._kline_repo.update_sync_date(today)
+        self._kline_repo.checkpoint()
         logger.info(f"增量更新完成，保存 {total_count} 条记录")
 
 
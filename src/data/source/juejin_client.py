@@ -6,11 +6,16 @@
 包含懒加载认证、指数退避重试、分批请求等特性。
 """
 
-import logging
+import random
+import re
+import threading
 import time
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import fields
+from datetime import date
 from typing import Iterator
 
+import numpy as np
 import pandas as pd
 from gm.api import (
     set_token,
@@ -18,6 +23,7 @@ from gm.api import (
     get_trading_dates,
     history,
 )
+from loguru import logger
 
 from src.data.types import StockInfo, TradingDay
 from src.data.source.exceptions import (
@@ -26,8 +32,6 @@ from src.data.source.exceptions import (
     JuejinRateLimitError,
 )
 
-logger = logging.getLogger(__name__)
-
 
 # ============================================================
 # 常量
@@ -49,10 +53,131 @@ _BOARD_NAME_TO_CODE: dict[str, int] = {
     "bse": 10100104,
 }
 
+# get_symbols 返回字段（按 StockInfo 字段顺序）
+_STOCK_INFO_FIELDS = [
+    "symbol", "sec_id", "exchange", "sec_name", "board", "is_st", "is_suspended",
+    "listed_date", "pre_close", "upper_limit", "lower_limit", "adj_factor",
+]
+
+# StockInfo 字段名（get_stock_pool_df 的输出列）
+STOCK_COLUMNS = tuple(f.name for f in fields(StockInfo))
+
 # 默认重试配置
 _DEFAULT_MAX_RETRIES = 3
 _DEFAULT_BASE_DELAY = 1.0  # 秒
+_MAX_BACKOFF_EXPONENT = 6  # 退避上限 1s * 2^6 = 64s
+_RATE_LIMIT_BASE_DELAY = 2.0  # 触发频率限制后的首次退避上限（秒），逐次翻倍
+_RATE_LIMIT_MAX_DELAY = 60.0  # 频率限制退避的单次等待上限（秒）
+
+# 限流错误信息中的建议等待秒数，如 "retry after 5" / "Retry-After: 5" / "5秒后重试"
+_RETRY_AFTER_PATTERN = re.compile(r"retry[-_ ]?after\D{0,3}(\d+)|(\d+)\s*秒后", re.IGNORECASE)
 _DEFAULT_BATCH_SIZE = 200  # 每批股票数量
+_DEFAULT_MAX_WORKERS = 4   # K线并发请求批次数
+
+# K线单次请求的行数上限（低于掘金单次返回上限），按自然日估算交易日占比
+_MAX_BARS_PER_REQUEST = 30000
+_TRADING_DAY_RATIO = 5 / 7
+
+# 交易日历结果的实例内缓存条数
+_CALENDAR_CACHE_SIZE = 32
+
+# 熔断配置：连续失败次数阈值、熔断后放行试探请求前的等待秒数
+_BREAKER_FAILURE_THRESHOLD = 5
+_BREAKER_RESET_TIMEOUT = 30.0
+
+# 进程内已设置的 Token（gm.api 的认证为全局状态，各实例共享）
+_AUTH_LOCK = threading.Lock()
+_AUTHED_TOKEN: str | None = None
+
+# K线请求字段（只取入库需要的列）
+_KLINE_FIELDS = ["symbol", "eob", "open", "high", "low", "close", "volume", "amount"]
+_KLINE_PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+class _CircuitBreaker:
+    """
+    掘金API熔断器（进程内共享，线程安全）
+
+    只有网络等临时错误计入连续失败，限流与认证错误不计入；
+    连续失败达到阈值后进入 open 状态，直接拒绝请求；
+    超过 reset_timeout 后进入 half_open，只放行一次试探请求，成功则恢复 closed。
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._fail_count = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """是否允许发起请求"""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at > self._reset_timeout:
+                self._state = "half_open"
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """请求成功：计数清零并恢复 closed"""
+        with self._lock:
+            self._state, self._fail_count = "closed", 0
+
+    def record_rejected(self) -> None:
+        """请求被服务端拒绝（限流/认证）：服务可达，不计入连续失败，半开试探时恢复 closed"""
+        with self._lock:
+            if self._state == "half_open":
+                self._state, self._fail_count = "closed", 0
+
+    def record_failure(self) -> None:
+        """请求失败：试探失败或连续失败达到阈值时进入 open"""
+        with self._lock:
+            self._fail_count += 1
+            if self._state == "half_open" or self._fail_count >= self._failure_threshold:
+                self._state, self._opened_at = "open", time.monotonic()
+
+
+_BREAKER = _CircuitBreaker(_BREAKER_FAILURE_THRESHOLD, _BREAKER_RESET_TIMEOUT)
+
+
+def _retry_after_seconds(error: Exception) -> int | None:
+    """从限流异常中取服务端建议的等待秒数（retry_after 属性或错误信息），无则返回 None"""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        match = _RETRY_AFTER_PATTERN.search(str(error))
+        retry_after = match and int(match.group(1) or match.group(2))
+    return int(retry_after) if retry_after else None
+
+
+def _infos_to_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """get_symbols 结果（已映射板块）按列整理为 StockInfo 字段的 DataFrame"""
+    # 上市日期取前10位（datetime 与字符串统一处理），无效值为 NaT
+    listed = pd.to_datetime(
+        df["listed_date"].astype(str).str[:10], format="%Y-%m-%d", errors="coerce"
+    )
+
+    # 数值列：缺失或为0按默认值填充（价格0，复权因子1）
+    prices = {
+        col: pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+        for col in ("pre_close", "upper_limit", "lower_limit")
+    }
+    adj_factor = pd.to_numeric(df["adj_factor"], errors="coerce").fillna(1.0)
+
+    return pd.DataFrame({
+        "symbol": df["symbol"].fillna(""),
+        "code": df["sec_id"].fillna(""),
+        "exchange": df["exchange"].fillna(""),
+        "name": df["sec_name"].fillna(""),
+        "board": df["board"].astype("category"),
+        "is_st": df["is_st"].fillna(False).astype(bool),
+        "is_suspended": df["is_suspended"].fillna(False).astype(bool),
+        "listed_date": listed,
+        **prices,
+        "adj_factor": adj_factor.mask(adj_factor == 0, 1.0),
+    }).reset_index(drop=True)
 
 
 class JuejinClient:
@@ -62,7 +187,7 @@ class JuejinClient:
     特性：
     - 懒加载认证：首次API调用时自动设置Token
     - 指数退避重试：网络异常自动重试
-    - 分批请求：大量股票自动分批处理
+    - 分批请求：大量股票自动分批处理，多批并发下载
 
     Parameters
     ----------
@@ -72,6 +197,8 @@ class JuejinClient:
         最大重试次数，默认3次
     batch_size : int
         分批请求时每批股票数量，默认200
+    max_workers : int
+        K线并发请求的批次数，默认4
 
     Examples
     --------
@@ -85,10 +212,14 @@ class JuejinClient:
         token: str,
         max_retries: int = _DEFAULT_MAX_RETRIES,
         batch_size: int = _DEFAULT_BATCH_SIZE,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
     ) -> None:
         self._token = token
         self._max_retries = max_retries
         self._batch_size = batch_size
+        self._max_workers = max_workers
+        # 交易日历结果缓存（TradingDay 不可变，可安全共享）
+        self._calendar_cache: dict[tuple[str, date, date], tuple[TradingDay, ...]] = {}
         self._authenticated = False
 
     def _ensure_auth(self) -> None:
@@ -99,17 +230,25 @@ class JuejinClient:
         if not self._token:
             raise JuejinAuthError("Token不能为空")
 
-        try:
-            set_token(self._token)
+        # set_token 作用于整个进程：同一 Token 只设置一次，加锁避免并发重复设置
+        global _AUTHED_TOKEN
+        with _AUTH_LOCK:
+            if _AUTHED_TOKEN != self._token:
+                try:
+                    set_token(self._token)
+                except Exception as e:
+                    raise JuejinAuthError(f"Token设置失败: {e}") from e
+                _AUTHED_TOKEN = self._token
+                logger.info("掘金量化认证成功")
             self._authenticated = True
-            logger.info("掘金量化认证成功")
-        except Exception as e:
-            raise JuejinAuthError(f"Token设置失败: {e}") from e
 
     def _retry_call(self, func: callable, *args, **kwargs):
         """
         带指数退避的重试调用
 
+        网络等临时错误与频率限制均按全抖动指数退避重试（频率限制的等待更长，
+        服务端给出 retry_after 时按其等待），认证错误直接抛出不重试。
+
         Parameters
         ----------
         func : callable
@@ -124,34 +263,60 @@ class JuejinClient:
 
         Raises
         ------
+        JuejinRateLimitError
+            重试耗尽后仍被频率限制
+        JuejinAuthError
+            认证失败
         JuejinAPIError
-            重试耗尽后仍然失败
+            重试耗尽后仍然失败，或熔断器处于打开状态
         """
         last_error = None
+        rate_limited = False
+        retry_after = None
 
         for attempt in range(self._max_retries):
+            if not _BREAKER.allow():
+                raise JuejinAPIError("掘金API连续失败，已熔断，请稍后重试")
             try:
-                return func(*args, **kwargs)
+                result = func(*args, **kwargs)
+                _BREAKER.record_success()
+                return result
             except Exception as e:
                 last_error = e
                 error_msg = str(e).lower()
-
-                # 检查是否为频率限制
-                if "rate" in error_msg or "limit" in error_msg:
-                    raise JuejinRateLimitError() from e
+                rate_limited = "rate" in error_msg or "limit" in error_msg
 
                 # 检查是否为认证错误（不重试）
-                if "token" in error_msg or "auth" in error_msg:
+                if not rate_limited and ("token" in error_msg or "auth" in error_msg):
+                    _BREAKER.record_rejected()
                     raise JuejinAuthError(str(e)) from e
 
-                # 计算退避时间：1s, 2s, 4s...
-                delay = _DEFAULT_BASE_DELAY * (2 ** attempt)
+                if rate_limited:
+                    _BREAKER.record_rejected()
+                    # 频率限制：以更长的起点做封顶的全抖动退避，错开并发批次的重试
+                    cap = min(_RATE_LIMIT_BASE_DELAY * (2 ** attempt), _RATE_LIMIT_MAX_DELAY)
+                    retry_after = _retry_after_seconds(e)
+                    reason = "触发频率限制"
+                else:
+                    _BREAKER.record_failure()
+                    # 全抖动退避：在 [0, 1s/2s/4s...] 内随机等待，避免并发请求同步重试
+                    cap = _DEFAULT_BASE_DELAY * (2 ** min(attempt, _MAX_BACKOFF_EXPONENT))
+                    reason = "API调用失败"
+                if attempt + 1 == self._max_retries:
+                    break  # 最后一次失败后不再等待
+                # 服务端给出等待时间时照此等待（不超过单次上限），否则随机抖动
+                if rate_limited and retry_after:
+                    delay = min(retry_after, _RATE_LIMIT_MAX_DELAY)
+                else:
+                    delay = random.uniform(0, cap)
                 logger.warning(
-                    f"API调用失败 (尝试 {attempt + 1}/{self._max_retries}): {e}, "
+                    f"{reason} (尝试 {attempt + 1}/{self._max_retries}): {e}, "
                     f"{delay:.1f}秒后重试"
                 )
                 time.sleep(delay)
 
+        if rate_limited:
+            raise JuejinRateLimitError(retry_after) from last_error
         raise JuejinAPIError(f"重试{self._max_retries}次后仍然失败: {last_error}")
 
     def get_stock_pool(self, boards: list[str] | None = None) -> list[StockInfo]:
@@ -169,6 +334,28 @@ class JuejinClient:
         list[StockInfo]
             股票信息列表
         """
+        df = self.get_stock_pool_df(boards)
+
+        # 上市日期 NaT 转为 None，其余列按 StockInfo 字段顺序逐列转换
+        listed = df["listed_date"]
+        listed_dates = listed.dt.date.astype(object).where(listed.notna(), None)
+        columns = [listed_dates if f == "listed_date" else df[f] for f in STOCK_COLUMNS]
+        return [StockInfo(*row) for row in zip(*(col.tolist() for col in columns))]
+
+    def get_stock_pool_df(self, boards: list[str] | None = None) -> pd.DataFrame:
+        """
+        获取股票池（列式 DataFrame，不构造 StockInfo 对象）
+
+        Parameters
+        ----------
+        boards : list[str] | None
+            板块列表，含义同 get_stock_pool
+
+        Returns
+        -------
+        pd.DataFrame
+            列与 StockInfo 字段一致；board 为 category，listed_date 为 datetime64（缺失为 NaT）
+        """
         self._ensure_auth()
 
         # 获取全部A股（sec_type1=1010, sec_type2=101001）
@@ -181,43 +368,12 @@ class JuejinClient:
             skip_st=False,
         )
 
-        if not infos:
-            return []
-
-        result: list[StockInfo] = []
-
-        for info in infos:
-            board_code = info.get("board", 0)
-            board_name = _BOARD_CODE_TO_NAME.get(board_code, "unknown")
-
-            # 按板块过滤
-            if boards and board_name not in boards:
-                continue
-
-            # 处理上市日期
-            listed = info.get("listed_date")
-            listed_date = None
-            if listed:
-                if hasattr(listed, 'date'):
-                    listed_date = listed.date()
-                elif isinstance(listed, str):
-                    listed_date = datetime.strptime(listed[:10], "%Y-%m-%d").date()
-
-            stock = StockInfo(
-                symbol=info.get("symbol", ""),
-                code=info.get("sec_id", ""),
-                exchange=info.get("exchange", ""),
-                name=info.get("sec_name", ""),
-                board=board_name,
-                is_st=bool(info.get("is_st", False)),
-                is_suspended=bool(info.get("is_suspended", False)),
-                listed_date=listed_date,
-                pre_close=float(info.get("pre_close", 0) or 0),
-                upper_limit=float(info.get("upper_limit", 0) or 0),
-                lower_limit=float(info.get("lower_limit", 0) or 0),
-                adj_factor=float(info.get("adj_factor", 1) or 1),
-            )
-            result.append(stock)
+        # 按列批量转换，先做板块过滤
+        df = pd.DataFrame(infos or []).reindex(columns=_STOCK_INFO_FIELDS)
+        df["board"] = df["board"].map(_BOARD_CODE_TO_NAME).fillna("unknown")
+        if boards:
+            df = df[df["board"].isin(boards)]
+        result = _infos_to_frame(df)
 
         logger.info(f"获取股票池完成，共 {len(result)} 只股票")
         return result
@@ -244,7 +400,28 @@ class JuejinClient:
         -------
         list[TradingDay]
             交易日信息列表
+
+        Notes
+        -----
+        同一实例内按 (exchange, start_date, end_date) 缓存最近 _CALENDAR_CACHE_SIZE 次结果。
         """
+        key = (exchange, start_date, end_date)
+        cached = self._calendar_cache.pop(key, None)
+        if cached is None:
+            cached = tuple(self._fetch_trading_calendar(exchange, start_date, end_date))
+            if len(self._calendar_cache) >= _CALENDAR_CACHE_SIZE:
+                # 淘汰最久未使用的条目（字典按插入顺序，命中时重新插入到末尾）
+                self._calendar_cache.pop(next(iter(self._calendar_cache)))
+        self._calendar_cache[key] = cached
+        return list(cached)
+
+    def _fetch_trading_calendar(
+        self,
+        exchange: str,
+        start_date: date,
+        end_date: date,
+    ) -> list[TradingDay]:
+        """请求交易日并构建逐日日历（参数与返回同 get_trading_calendar）"""
         self._ensure_auth()
 
         # 获取交易日列表
@@ -258,54 +435,36 @@ class JuejinClient:
         if not trading_dates:
             return []
 
-        # 转换为 date 对象的 set
-        trading_set: set[date] = set()
-        for d in trading_dates:
-            if isinstance(d, datetime):
-                trading_set.add(d.date())
-            elif isinstance(d, date):
-                trading_set.add(d)
-            elif isinstance(d, str):
-                # 字符串格式: "2024-01-02" 或 "2024-01-02 00:00:00"
-                trading_set.add(datetime.strptime(d[:10], "%Y-%m-%d").date())
+        # 解析为 datetime64[D] 并排序去重（date / datetime / "2024-01-02[ 00:00:00]" 均取前10位）
+        trading_days = np.unique(
+            np.array([str(d)[:10] for d in trading_dates], dtype="datetime64[D]")
+        )
+        trading_list = trading_days.tolist()
+        n_trading = len(trading_list)
 
-        trading_list = sorted(trading_set)
+        # 向量化定位：每个自然日在交易日序列中的插入位置，交易日即命中该位置
+        calendar_days = np.arange(
+            np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1
+        )
+        positions = np.searchsorted(trading_days, calendar_days).tolist()
+        is_trading_flags = np.isin(calendar_days, trading_days).tolist()
 
-        # 构建结果，计算前后交易日
+        # 构建结果，交易日的前后交易日直接按位置取相邻元素
         result: list[TradingDay] = []
-        current = start_date
-
-        while current <= end_date:
-            is_trading = current in trading_set
-
-            # 查找前一交易日
-            prev_td = None
-            if is_trading:
-                idx = trading_list.index(current)
-                if idx > 0:
-                    prev_td = trading_list[idx - 1]
-
-            # 查找下一交易日
-            next_td = None
-            if is_trading:
-                idx = trading_list.index(current)
-                if idx < len(trading_list) - 1:
-                    next_td = trading_list[idx + 1]
-
+        for day, pos, is_trading in zip(calendar_days.tolist(), positions, is_trading_flags):
             result.append(TradingDay(
                 exchange=exchange,
-                date=current,
+                date=day,
                 is_trading_day=is_trading,
-                prev_trading_day=prev_td,
-                next_trading_day=next_td,
+                prev_trading_day=trading_list[pos - 1] if is_trading and pos > 0 else None,
+                next_trading_day=(
+                    trading_list[pos + 1] if is_trading and pos + 1 < n_trading else None
+                ),
             ))
 
-            # 下一天
-            current = date.fromordinal(current.toordinal() + 1)
-
         logger.info(
             f"获取交易日历完成: {exchange} {start_date} ~ {end_date}, "
-            f"共 {len(trading_list)} 个交易日"
+            f"共 {n_trading} 个交易日"
         )
         return result
 
@@ -335,10 +494,13 @@ class JuejinClient:
         pd.DataFrame
             每批股票的K线数据，包含列:
             symbol, date, open, high, low, close, volume, amount, adj_factor
+            其中 date 为 datetime64 列（已截断到天），价格列与 adj_factor 为 float64
 
         Notes
         -----
-        为避免单次请求超时，自动分批请求，每批最多 batch_size 只股票。
+        为避免单次请求超时或超出返回上限，自动分批请求：每批最多 batch_size 只股票，
+        日期跨度较长时按单批约 _MAX_BARS_PER_REQUEST 行缩小批次；
+        各批最多 max_workers 个并发请求，按完成顺序返回。
         """
         self._ensure_auth()
 
@@ -350,58 +512,87 @@ class JuejinClient:
         start_str = start_date.strftime("%Y-%m-%d")
         end_str = end_date.strftime("%Y-%m-%d")
 
-        # 分批请求
-        for i in range(0, len(symbols), self._batch_size):
-            batch = symbols[i : i + self._batch_size]
-            batch_str = ",".join(batch)
-
-            logger.debug(f"请求K线: 批次 {i // self._batch_size + 1}, {len(batch)} 只股票")
-
-            result = self._retry_call(
-                history,
-                symbol=batch_str,
-                frequency="1d",
-                start_time=start_str,
-                end_time=end_str,
-                adjust=adj_mode,
-                fields="symbol,eob,open,high,low,close,volume,amount,pre_close",
-            )
-
-            # 掘金返回 list，需要转换为 DataFrame
-            if result is None or len(result) == 0:
-                continue
-
-            if isinstance(result, list):
-                df = pd.DataFrame([vars(item) if hasattr(item, '__dict__') else item for item in result])
-            else:
-                df = result
-
-            if df.empty:
-                continue
-
-            # 重命名列
-            df = df.rename(columns={"eob": "date"})
-
-            # 提取日期部分
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"]).dt.date
-
-            # 计算复权因子（后复权价 / 实际价 = adj_factor）
-            # 掘金返回的已经是复权后价格，这里用 close/pre_close 近似
-            if "pre_close" in df.columns and adj_mode != 0:
-                # 简化处理：复权因子设为1（因掘金直接返回复权价）
-                df["adj_factor"] = 1.0
-                df = df.drop(columns=["pre_close"])
-            else:
-                df["adj_factor"] = 1.0
-
-            # 确保列顺序
-            expected_cols = [
-                "symbol", "date", "open", "high", "low",
-                "close", "volume", "amount", "adj_factor"
-            ]
-            df = df[[c for c in expected_cols if c in df.columns]]
-
-            yield df
-
-        logger.info(f"K线获取完成: {len(symbols)} 只股票, {start_date} ~ {end_date}")
+        # 分批并发请求，按完成顺序返回（每行均带 symbol，无需保持批次顺序）
+        batch_size = self.kline_batch_size(start_date, end_date)
+        batches = [
+            symbols[i : i + batch_size]
+            for i in range(0, len(symbols), batch_size)
+        ]
+        # 只有一批时直接请求：调用方已自行并发时不再叠加一层线程池
+        if len(batches) == 1:
+            df = self._fetch_kline_batch(batches[0], start_str, end_str, adj_mode)
+            if df is not None:
+                yield df
+        else:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = [
+                    executor.submit(self._fetch_kline_batch, batch, start_str, end_str, adj_mode)
+                    for batch in batches
+                ]
+                for future in as_completed(futures):
+                    df = future.result()
+                    if df is not None:
+                        yield df
+
+        logger.info("K线获取完成: {} 只股票, {} ~ {}", len(symbols), start_date, end_date)
+
+    def kline_batch_size(self, start_date: date, end_date: date) -> int:
+        """
+        按日期跨度估算单次请求的股票数
+
+        单批行数不超过 _MAX_BARS_PER_REQUEST，且不超过 batch_size；
+        调用方按此值切分股票时，每批恰好对应一次掘金请求。
+        """
+        days = max((end_date - start_date).days + 1, 1)
+        bars_per_symbol = max(int(days * _TRADING_DAY_RATIO), 1)
+        return max(1, min(self._batch_size, _MAX_BARS_PER_REQUEST // bars_per_symbol))
+
+    def _fetch_kline_batch(
+        self,
+        batch: list[str],
+        start_str: str,
+        end_str: str,
+        adj_mode: int,
+    ) -> pd.DataFrame | None:
+        """请求一批股票的K线并整理列，无数据返回 None"""
+        # 参数延迟格式化：DEBUG 未启用时不拼接日志字符串
+        logger.debug("请求K线: {} ~ {}, {} 只股票", batch[0], batch[-1], len(batch))
+
+        result = self._retry_call(
+            history,
+            symbol=",".join(batch),
+            frequency="1d",
+            start_time=start_str,
+            end_time=end_str,
+            adjust=adj_mode,
+            fields=",".join(_KLINE_FIELDS),
+        )
+
+        # 掘金返回 list，需要转换为 DataFrame
+        if result is None or len(result) == 0:
+            return None
+
+        if isinstance(result, list):
+            # 字典直接按指定列构造；对象取其 __dict__，不先物化中间列表
+            rows = result if isinstance(result[0], dict) else (vars(item) for item in result)
+            df = pd.DataFrame.from_records(rows, columns=_KLINE_FIELDS)
+        else:
+            df = result[_KLINE_FIELDS]
+
+        if df.empty:
+            return None
+
+        # 重命名列，日期截断到天（保持 datetime64 列，不逐行装箱为 date 对象）
+        df = df.rename(columns={"eob": "date"})
+        dates = pd.to_datetime(df["date"])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        df["date"] = dates.dt.normalize()
+
+        # 价格列统一为 float64（后复权价可远超 float32 的精确范围）
+        df = df.astype({col: np.float64 for col in _KLINE_PRICE_COLUMNS})
+        df["volume"] = df["volume"].fillna(0).astype(np.int64)
+
+        # 复权因子设为1（掘金直接返回复权后价格）
+        df["adj_factor"] = 1.0
+        return df
@@ -10,6 +10,16 @@
 - 东方财富: 1.600000, 0.000001
 """
 
+import numpy as np
+
+# 代码首位 -> 掘金交易所前缀（6开头是上海，其他是深圳）
+_JUEJIN_PREFIX = {'6': 'SHSE.'}
+_JUEJIN_DEFAULT_PREFIX = 'SZSE.'
+
+# 代码首位 -> 东方财富市场编号（5/6开头是上海，其他是深圳）
+_EASTMONEY_MARKET = {'5': '1.', '6': '1.'}
+_EASTMONEY_DEFAULT_MARKET = '0.'
+
 
 def to_juejin_symbol(code: str) -> str:
     """
@@ -34,19 +44,9 @@ def to_juejin_symbol(code: str) -> str:
     >>> to_juejin_symbol('300750')
     'SZSE.300750'
     """
-    # 去掉可能的前缀
-    if '.' in code:
-        raw = code.split('.')[-1]
-    else:
-        raw = code
-
-    # 确保6位
-    raw = raw.zfill(6)
-
-    # 6开头是上海，其他是深圳
-    if raw.startswith('6'):
-        return f'SHSE.{raw}'
-    return f'SZSE.{raw}'
+    # 去掉可能的前缀并补足6位，按首位查表得到交易所
+    raw = code.rpartition('.')[2].zfill(6)
+    return _JUEJIN_PREFIX.get(raw[0], _JUEJIN_DEFAULT_PREFIX) + raw
 
 
 def from_juejin_symbol(symbol: str) -> str:
@@ -75,6 +75,59 @@ def from_juejin_symbol(symbol: str) -> str:
     return symbol
 
 
+def to_juejin_symbols(codes) -> np.ndarray:
+    """
+    批量转换为掘金格式（向量化，规则同 to_juejin_symbol）
+
+    Parameters
+    ----------
+    codes : array-like of str
+        股票代码序列，如 ['000001', '600000']
+
+    Returns
+    -------
+    np.ndarray
+        掘金格式代码数组
+
+    Examples
+    --------
+    >>> to_juejin_symbols(['600000', '1', 'SZSE.300750']).tolist()
+    ['SHSE.600000', 'SZSE.000001', 'SZSE.300750']
+    """
+    raw = from_juejin_symbols(codes)
+    if raw.size == 0:
+        return raw
+    raw = np.char.zfill(raw, 6)
+    prefix = np.where(np.char.startswith(raw, '6'), _JUEJIN_PREFIX['6'], _JUEJIN_DEFAULT_PREFIX)
+    return np.char.add(prefix, raw)
+
+
+def from_juejin_symbols(symbols) -> np.ndarray:
+    """
+    批量提取纯数字代码（向量化，规则同 from_juejin_symbol）
+
+    Parameters
+    ----------
+    symbols : array-like of str
+        掘金格式代码序列，如 ['SHSE.600000', 'SZSE.000001']
+
+    Returns
+    -------
+    np.ndarray
+        纯数字代码数组
+
+    Examples
+    --------
+    >>> from_juejin_symbols(['SHSE.600000', '000001']).tolist()
+    ['600000', '000001']
+    """
+    # numpy 字符串函数不支持空数组，直接返回
+    arr = np.asarray(symbols, dtype=str)
+    if arr.size == 0:
+        return arr
+    return np.char.rpartition(arr, '.')[..., 2]
+
+
 def to_eastmoney_code(code: str) -> str:
     """
     转换为东方财富格式
@@ -96,10 +149,6 @@ def to_eastmoney_code(code: str) -> str:
     >>> to_eastmoney_code('600000')
     '1.600000'
     """
-    # 去掉可能的后缀
-    raw = code.split('.')[0]
-
-    # 5/6开头是上海，其他是深圳
-    if raw[0] in ('5', '6'):
-        return f'1.{raw}'
-    return f'0.{raw}'
+    # 去掉可能的后缀，按首位查表得到市场编号
+    raw = code.partition('.')[0]
+    return _EASTMONEY_MARKET.get(raw[0], _EASTMONEY_DEFAULT_MARKET) + raw
@@ -57,10 +57,13 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# 所有页面同一主机，复用一个客户端（keep-alive），避免每页重新建立 TCP/TLS 连接
+_CLIENT = httpx.Client(headers=HEADERS, timeout=30, follow_redirects=True)
+
 
 def fetch_page(url: str) -> str:
     """获取页面内容"""
-    resp = httpx.get(url, headers=HEADERS, timeout=30, follow_redirects=True)
+    resp = _CLIENT.get(url)
     resp.raise_for_status()
     return resp.text
 
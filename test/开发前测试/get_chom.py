@@ -6,6 +6,15 @@ from typing import List, Dict, Any
 import requests
 import math
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba 为可选加速依赖，缺失时退化为纯 NumPy 实现
+    def njit(*_args, **_kwargs):
+        return lambda func: func
+
 def gen_eastmoney_code(rawcode: str) -> str:
     if rawcode[0] == '5':
         return f'1.{rawcode}'
@@ -14,6 +23,51 @@ def gen_eastmoney_code(rawcode: str) -> str:
     return f'0.{rawcode}'
 
 
+@njit(cache=True)
+def _cm_kernel(bars, turnover_rates, minprice, accuracy, factor):
+    """
+    逐根K线衰减并累加三角分布筹码
+
+    bars 为 (N, 4) 的 [open, close, high, low]，turnover_rates 为换手率（小数）。
+    """
+    xdata = np.zeros(factor, dtype=np.float64)
+    for i in range(bars.shape[0]):
+        open_price, close, high, low = bars[i, 0], bars[i, 1], bars[i, 2], bars[i, 3]
+        turnover_rate = turnover_rates[i]
+
+        # 平均价格、价格索引
+        avg = (open_price + close + high + low) / 4
+        H_index = math.floor((high - minprice) / accuracy)
+        L_index = math.ceil((low - minprice) / accuracy)
+
+        # 衰减处理（重要步骤）- 对历史筹码进行衰减
+        xdata *= (1 - turnover_rate)
+
+        if high == low:
+            # 一字板：矩形分布，G点高度为 factor - 1
+            g_idx = math.floor((avg - minprice) / accuracy)
+            if 0 <= g_idx < factor:
+                xdata[g_idx] += (factor - 1) * turnover_rate / 2
+            continue
+
+        # 正常K线：三角分布，G点高度为 2 / (high - low)，一次处理 [L_index, H_index] 内全部价格桶
+        g_height = 2 / (high - low)
+        lo, hi = max(L_index, 0), min(H_index, factor - 1)
+        if lo > hi:
+            continue
+        curprice = minprice + accuracy * np.arange(lo, hi + 1)
+        if abs(avg - low) < 1e-8:
+            upper = np.ones_like(curprice)
+        else:
+            upper = (curprice - low) / (avg - low)
+        if abs(high - avg) < 1e-8:
+            lower = np.ones_like(curprice)
+        else:
+            lower = (high - curprice) / (high - avg)
+        xdata[lo:hi + 1] += np.where(curprice <= avg, upper, lower) * g_height * turnover_rate
+    return xdata
+
+
 def generate_cm_result(kdata: List[List], index: int, accuracy_factor: int = 150, range_val: int = None) -> Dict[
     str, Any]:
     """
@@ -36,118 +90,40 @@ def generate_cm_result(kdata: List[List], index: int, accuracy_factor: int = 150
         raise ValueError('invalid index')
 
     # 2. 计算最高价和最低价
-    maxprice = 0
-    minprice = 0
-    for i, elements in enumerate(calc_kdata):
-        high = elements[3]  # 最高价索引为3
-        low = elements[4]  # 最低价索引为4
-
-        if i == 0:
-            maxprice = high
-            minprice = low
-        else:
-            maxprice = max(maxprice, high)
-            minprice = min(minprice, low)
+    bars = np.array([row[1:5] for row in calc_kdata], dtype=np.float64)  # open, close, high, low
+    maxprice = float(bars[:, 2].max())
+    minprice = float(bars[:, 3].min())
 
     # 3. 计算精度
     factor = accuracy_factor
     accuracy = max(0.01, (maxprice - minprice) / (factor - 1))
 
     # 4. 生成价格区间
-    yrange = []
-    for i in range(factor):
-        price = minprice + accuracy * i
-        yrange.append(round(price, 2))
-
-    # 5. 初始化筹码分布数组
-    def create_number_array(count):
-        return [0.0] * count
-
-    xdata = create_number_array(factor)
-
-    # 6. 核心计算：遍历K线进行筹码分布计算
-    for i, eles in enumerate(calc_kdata):
-        # 解析K线数据
-        open_price = eles[1]
-        close = eles[2]
-        high = eles[3]
-        low = eles[4]
-        hsl = eles[8] if len(eles) > 8 else 0
-        turnover_rate = min(1, hsl / 100)
-
-        # 平均价格
-        avg = (open_price + close + high + low) / 4
-
-        # 价格索引
-        H_index = math.floor((high - minprice) / accuracy)
-        L_index = math.ceil((low - minprice) / accuracy)
+    yrange = [round(minprice + accuracy * i, 2) for i in range(factor)]
 
-        # G点坐标计算（关键参数）
-        if high == low:
-            # 一字板情况
-            G_point = [factor - 1, math.floor((avg - minprice) / accuracy)]
-        else:
-            G_point = [2 / (high - low), math.floor((avg - minprice) / accuracy)]
+    # 5~6. 核心计算：遍历K线进行筹码分布计算（JIT 内核）
+    hsls = np.array([eles[8] if len(eles) > 8 else 0 for eles in calc_kdata], dtype=np.float64)
+    turnover_rates = np.minimum(1, hsls / 100)
+    xdata = _cm_kernel(bars, turnover_rates, minprice, accuracy, factor)
 
-        # 衰减处理（重要步骤）- 对历史筹码进行衰减
-        for n in range(len(xdata)):
-            xdata[n] *= (1 - turnover_rate)
-
-        # 三角分布计算
-        if high == low:
-            # 一字板：矩形分布
-            if 0 <= G_point[1] < len(xdata):
-                xdata[G_point[1]] += G_point[0] * turnover_rate / 2
-        else:
-            # 正常K线：三角分布
-            for j in range(L_index, H_index + 1):
-                if j >= len(xdata) or j < 0:
-                    continue
-
-                curprice = minprice + accuracy * j
-                if curprice <= avg:
-                    # 上半三角
-                    if abs(avg - low) < 1e-8:
-                        xdata[j] += G_point[0] * turnover_rate
-                    else:
-                        xdata[j] += (curprice - low) / (avg - low) * G_point[0] * turnover_rate
-                else:
-                    # 下半三角
-                    if abs(high - avg) < 1e-8:
-                        xdata[j] += G_point[0] * turnover_rate
-                    else:
-                        xdata[j] += (high - curprice) / (high - avg) * G_point[0] * turnover_rate
-
-    # 7. 计算总筹码量（使用高精度）
-    total_chips = 0.0
-    for i in range(factor):
-        x_val_str = f"{xdata[i]:.12g}"
-        x_val = float(x_val_str)
-        total_chips += x_val
+    # 7. 计算总筹码量（使用高精度）：按12位有效数字取值后顺序累加
+    x_vals = np.array([float(f"{x:.12g}") for x in xdata])
+    cum_chips = np.cumsum(x_vals)
+    total_chips = cum_chips[-1]
+    price_grid = minprice + accuracy * np.arange(factor)
 
     # 8. 获取当前价格
     current_price = kdata[index][2]  # 收盘价
 
-    # 9. 内部函数：根据筹码量获取价格
+    # 9. 内部函数：根据筹码量获取价格（累计筹码首次超过 chip_amount 的价格桶）
     def get_cost_by_chip(chip_amount):
-        sum_chips = 0.0
-        for i in range(factor):
-            # 使用与上面相同的精度处理
-            x_val_str = f"{xdata[i]:.12g}"
-            x_val = float(x_val_str)
-            if sum_chips + x_val > chip_amount:
-                return minprice + i * accuracy
-            sum_chips += x_val
-        return minprice + (factor - 1) * accuracy
-
-    # 10. 计算获利比例
+        i = min(int(np.searchsorted(cum_chips, chip_amount, side='right')), factor - 1)
+        return minprice + i * accuracy
+
+    # 10. 计算获利比例（价格桶单调递增，不高于 price 的部分即累计前缀）
     def get_benefit_part(price):
-        below = 0.0
-        for i in range(factor):
-            x_val_str = f"{xdata[i]:.12g}"
-            x_val = float(x_val_str)
-            if price >= minprice + i * accuracy:
-                below += x_val
+        count = int(np.searchsorted(price_grid, price, side='right'))
+        below = cum_chips[count - 1] if count > 0 else 0.0
         return below / total_chips if total_chips != 0 else 0
 
     # 11. 计算百分比筹码
@@ -185,7 +161,7 @@ def generate_cm_result(kdata: List[List], index: int, accuracy_factor: int = 150
 
     # 创建结果对象
     result = CYQData(
-        x=xdata,
+        x=xdata.tolist(),
         y=yrange,
         benefit_part=round(get_benefit_part(current_price), 6),
         avg_cost=round(avg_cost, 2),
@@ -220,12 +196,13 @@ def get_data():
     # 创建模拟K线数据
     # 格式: [time,open,close,high,low,volume,amount,amplitude,turnoverRate]
     savelist = []
-    for kn in range(0,len(res['data']['klines'])):
-        kdata = []
-        for i in res['data']['klines'][0:kn+1]:
-            l = i.split(',')
-            l = [l[0]] + [float(i1) for i1 in l[1:8]] + [float(l[10])]
-            kdata.append(l)
+    # K线只解析一次，逐日计算时取前缀切片
+    all_kdata = []
+    for i in res['data']['klines']:
+        l = i.split(',')
+        all_kdata.append([l[0]] + [float(i1) for i1 in l[1:8]] + [float(l[10])])
+    for kn in range(0,len(all_kdata)):
+        kdata = all_kdata[0:kn+1]
         cm_result = generate_cm_result(kdata, index=len(kdata)-1, accuracy_factor=150, range_val=None)
 
         riqi = kdata[-1][0]
@@ -18,6 +18,7 @@ from tempfile import TemporaryDirectory
 # 把项目根目录加入 path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+CONFIG_PATH = PROJECT_ROOT / "config" / "settings.yaml"
 
 from src.common.config import (
     load_config,
@@ -35,24 +36,13 @@ from src.common.config_generator import generate_config, save_config
 # 测试用例
 # ============================================================
 
-def test_load_config_success():
+def test_load_config_success(app_config: AppConfig):
     """测试配置加载成功"""
     print("[TEST] 配置加载测试")
     print()
 
     try:
-        # 使用项目真实配置文件
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-
-        if not config_path.exists():
-            print(f"  [SKIP] 配置文件不存在: {config_path}")
-            print("  请先运行 config_generator.py 生成配置文件")
-            return False
-
-        print(f"  [配置路径] {config_path}")
-        print()
-
-        cfg = load_config(config_path)
+        cfg = app_config
 
         print("  [检查返回类型]")
         if isinstance(cfg, AppConfig):
@@ -72,14 +62,13 @@ def test_load_config_success():
         return False
 
 
-def test_config_sections():
+def test_config_sections(app_config: AppConfig):
     """测试各配置分区访问"""
     print("[TEST] 各配置分区访问测试")
     print()
 
     try:
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
+        cfg = app_config
 
         print("  [检查各分区类型]")
 
@@ -115,14 +104,13 @@ def test_config_sections():
         return False
 
 
-def test_platform_config():
+def test_platform_config(app_config: AppConfig):
     """测试平台配置"""
     print("[TEST] 平台配置测试")
     print()
 
     try:
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
+        cfg = app_config
 
         print("  [平台配置项]")
 
@@ -157,14 +145,13 @@ def test_platform_config():
         return False
 
 
-def test_database_config_path():
+def test_database_config_path(app_config: AppConfig):
     """测试数据库配置路径转换"""
     print("[TEST] 数据库路径转换测试")
     print()
 
     try:
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
+        cfg = app_config
 
         print("  [检查路径类型是否为 Path 对象]")
 
@@ -204,14 +191,13 @@ def test_database_config_path():
         return False
 
 
-def test_technical_indicators():
+def test_technical_indicators(app_config: AppConfig):
     """测试技术指标配置"""
     print("[TEST] 技术指标配置测试")
     print()
 
     try:
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
+        cfg = app_config
 
         ti = cfg.technical_indicators
 
@@ -249,14 +235,13 @@ def test_technical_indicators():
         return False
 
 
-def test_daily_data_thresholds():
+def test_daily_data_thresholds(app_config: AppConfig):
     """测试日常数据阈值"""
     print("[TEST] 日常数据阈值测试")
     print()
 
     try:
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
+        cfg = app_config
 
         dd = cfg.daily_data
 
@@ -338,34 +323,41 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
 
+    if not CONFIG_PATH.exists():
+        print(f"[SKIP] 配置文件不存在: {CONFIG_PATH}")
+        print("请先运行 config_generator.py 生成配置文件")
+        sys.exit(0)
+
+    # 只解析一次配置，各测试共享
+    app_config = load_config(CONFIG_PATH)
     results = []
 
-    results.append(test_load_config_success())
+    results.append(test_load_config_success(app_config))
     print()
     print("-" * 60)
     print()
 
-    results.append(test_config_sections())
+    results.append(test_config_sections(app_config))
     print()
     print("-" * 60)
     print()
 
-    results.append(test_platform_config())
+    results.append(test_platform_config(app_config))
     print()
     print("-" * 60)
     print()
 
-    results.append(test_database_config_path())
+    results.append(test_database_config_path(app_config))
     print()
     print("-" * 60)
     print()
 
-    results.append(test_technical_indicators())
+    results.append(test_technical_indicators(app_config))
     print()
     print("-" * 60)
     print()
 
-    results.append(test_daily_data_thresholds())
+    results.append(test_daily_data_thresholds(app_config))
     print()
     print("-" * 60)
     print()
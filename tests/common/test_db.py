@@ -10,25 +10,18 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.common.config import load_config
+from src.common.config import AppConfig, load_config
 from src.common.db import DatabaseManager
 
 
-def test_db_manager():
+def test_db_manager(app_config: AppConfig, db_manager: DatabaseManager):
     """测试数据库管理器"""
     print("[TEST] 数据库管理器测试")
     print()
 
     try:
-        # 加载配置
-        config_path = PROJECT_ROOT / "config" / "settings.yaml"
-        cfg = load_config(config_path)
-        print(f"  [配置加载] {config_path} [OK]")
-
-        # 创建管理器
-        db_mgr = DatabaseManager(cfg)
-        print(f"  [管理器创建] DatabaseManager [OK]")
-        print()
+        cfg = app_config
+        db_mgr = db_manager
 
         # 检查目录创建
         print("  [数据目录检查]")
@@ -90,7 +83,8 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
 
-    result = test_db_manager()
+    app_config = load_config(PROJECT_ROOT / "config" / "settings.yaml")
+    result = test_db_manager(app_config, DatabaseManager(app_config))
 
     print()
     print("=" * 60)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+pytest 公共夹具
+
+配置文件在整个测试会话内只解析一次，各测试共享同一 AppConfig 与 DatabaseManager。
+设置环境变量 CHIP_NUMBA_WARMUP=1 时，会话开始前预热筹码计算的 JIT。
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.common.config import AppConfig, load_config
+from src.common.db import DatabaseManager
+
+CONFIG_PATH = PROJECT_ROOT / "config" / "settings.yaml"
+
+# 设为 1 时在会话开始前预热筹码计算的 numba JIT（CI 中启用）
+CHIP_WARMUP_ENV = "CHIP_NUMBA_WARMUP"
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    """按环境变量预热 JIT，编译耗时不计入具体测试"""
+    if os.environ.get(CHIP_WARMUP_ENV) == "1":
+        from src.algorithm.chip_distribution import warmup_jit
+        warmup_jit()
+
+
+@pytest.fixture(scope="session")
+def app_config() -> AppConfig:
+    """会话级配置对象，配置文件不存在时跳过依赖它的测试"""
+    if not CONFIG_PATH.exists():
+        pytest.skip(f"配置文件不存在: {CONFIG_PATH}，请先运行 config_generator.py 生成")
+    return load_config(CONFIG_PATH)
+
+
+@pytest.fixture(scope="session")
+def db_manager(app_config: AppConfig) -> Iterator[DatabaseManager]:
+    """会话级数据库管理器，各数据库常驻连接在测试间复用"""
+    manager = DatabaseManager(app_config)
+    yield manager
+    manager.close_all()
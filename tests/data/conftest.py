@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+数据层测试夹具
+
+仓库在整个测试会话内只构造一次：K线仓库使用内存库（测试会写入数据），
+股票池与交易日历仓库只读查询配置中的 stock_meta 库。
+"""
+
+import pytest
+
+from src.common.config import AppConfig
+from src.data.repository.kline import KlineRepository
+from src.data.repository.stock_pool import StockPoolRepository
+from src.data.repository.trading_calendar import TradingCalendarRepository
+
+
+@pytest.fixture(scope="session")
+def kline_repo() -> KlineRepository:
+    """会话级K线仓库（内存库，不触碰真实数据）"""
+    return KlineRepository.in_memory()
+
+
+@pytest.fixture(scope="session")
+def stock_repo(app_config: AppConfig) -> StockPoolRepository:
+    """会话级股票池仓库"""
+    return StockPoolRepository(app_config.database.stock_meta)
+
+
+@pytest.fixture(scope="session")
+def cal_repo(app_config: AppConfig) -> TradingCalendarRepository:
+    """会话级交易日历仓库"""
+    return TradingCalendarRepository(app_config.database.stock_meta)
@@ -7,9 +7,13 @@
 
 from datetime import date, timedelta
 
+import pandas as pd
+
 from src.common.config import load_config
 from src.data.source.juejin_client import JuejinClient
-from src.utils.symbol_utils import to_juejin_symbol, from_juejin_symbol
+from src.utils.symbol_utils import (
+    to_juejin_symbol, from_juejin_symbol, to_juejin_symbols, from_juejin_symbols,
+)
 
 
 def test_symbol_convert():
@@ -35,23 +39,30 @@ def test_symbol_convert():
         status = "✓" if result == expected else "✗"
         print(f"  {status} from_juejin_symbol('{symbol}') = '{result}' (期望: {expected})")
 
+    # 批量转换与逐个转换结果一致
+    codes, symbols = zip(*cases)
+    status = "✓" if to_juejin_symbols(codes).tolist() == list(symbols) else "✗"
+    print(f"  {status} to_juejin_symbols({list(codes)})")
+    status = "✓" if from_juejin_symbols(symbols).tolist() == list(codes) else "✗"
+    print(f"  {status} from_juejin_symbols({list(symbols)})")
+
 
 def test_stock_pool(client: JuejinClient):
     """测试获取股票池"""
     print("\n=== 测试获取股票池 ===")
 
-    stocks = client.get_stock_pool(["main"])
+    stocks = client.get_stock_pool_df(["main"])
     print(f"  主板股票数量: {len(stocks)}")
 
-    if stocks:
+    if not stocks.empty:
         # 显示前5只
         print("  前5只股票:")
-        for s in stocks[:5]:
+        for s in stocks.head(5).itertuples(index=False):
             print(f"    {s.symbol} {s.name} ST={s.is_st} 停牌={s.is_suspended}")
 
-        # 统计ST数量
-        st_count = sum(1 for s in stocks if s.is_st)
-        suspended_count = sum(1 for s in stocks if s.is_suspended)
+        # 按列统计ST与停牌数量
+        st_count = int(stocks["is_st"].sum())
+        suspended_count = int(stocks["is_suspended"].sum())
         print(f"  ST股票: {st_count}, 停牌股票: {suspended_count}")
 
 
@@ -86,16 +97,17 @@ def test_kline(client: JuejinClient):
     end = date.today()
     start = end - timedelta(days=30)
 
-    total_rows = 0
-    for df in client.get_kline(symbols, start, end):
-        total_rows += len(df)
+    # 先收集全部批次，再一次性合并
+    batches = list(client.get_kline(symbols, start, end))
+    for df in batches:
         print(f"  批次获取: {len(df)} 行")
+    kline = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
 
-        if not df.empty:
-            print(f"  列名: {list(df.columns)}")
-            print(f"  样例数据:\n{df.head(3).to_string()}")
+    if not kline.empty:
+        print(f"  列名: {list(kline.columns)}")
+        print(f"  样例数据:\n{kline.head(3).to_string()}")
 
-    print(f"  总计: {total_rows} 行K线数据")
+    print(f"  总计: {len(kline)} 行K线数据")
 
 
 def main():
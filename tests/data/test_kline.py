@@ -3,67 +3,61 @@
 K线仓库测试
 
 运行方式:
-    python -m tests.data.test_kline
+    python -m tests.data.test_kline                  # 使用配置中的K线库
+    TEST_MODE=fast python -m tests.data.test_kline   # 使用内存库，不落盘
 """
 
+import os
 from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
 
+import numpy as np
 import pandas as pd
 
 from src.common.config import load_config
-from src.data.repository.kline import KlineRepository
+from src.data.repository.kline import KlineRepository, PRICE_COLUMNS
 
+# 价格往返允许误差（DOUBLE 存储应无损）
+PRICE_TOLERANCE = 1e-9
 
-def test_basic(repo: KlineRepository):
+# 取该值时 main 使用内存库
+FAST_TEST_MODE = "fast"
+
+
+def test_basic(kline_repo: KlineRepository):
     """测试基本功能"""
+    repo = kline_repo
     print("\n=== 测试基本功能 ===")
 
     # 初始化状态
     is_completed = repo.is_init_completed()
     print(f"  初始化完成: {is_completed}")
 
-    # 已完成股票数
-    completed_count = repo.get_symbol_count()
+    # K线记录数、有数据的股票数、已完成股票数（单次查询汇总）
+    kline_count, symbol_count, completed_count = repo.status_summary()
     print(f"  已完成股票数: {completed_count}")
-
-    # K线记录数
-    kline_count = repo.count()
     print(f"  K线记录数: {kline_count}")
-
-    # 有数据的股票数
-    symbol_count = repo.count_symbols()
     print(f"  有数据股票数: {symbol_count}")
 
 
-def test_save_and_query(repo: KlineRepository):
+def test_save_and_query(kline_repo: KlineRepository):
     """测试保存和查询"""
+    repo = kline_repo
     print("\n=== 测试保存和查询 ===")
 
-    # 构造测试数据
-    test_data = pd.DataFrame([
-        {
-            "symbol": "SHSE.600000",
-            "date": date(2024, 1, 2),
-            "open": 10.0,
-            "high": 10.5,
-            "low": 9.8,
-            "close": 10.2,
-            "volume": 1000000,
-            "amount": 10200000.0,
-            "pre_close": 9.9,
-        },
-        {
-            "symbol": "SHSE.600000",
-            "date": date(2024, 1, 3),
-            "open": 10.2,
-            "high": 10.8,
-            "low": 10.1,
-            "close": 10.6,
-            "volume": 1200000,
-            "amount": 12720000.0,
-            "pre_close": 10.2,
-        },
-    ])
+    # 构造测试数据（按列构造，数值列直接为 float64/int64）
+    test_data = pd.DataFrame({
+        "symbol": ["SHSE.600000", "SHSE.600000"],
+        "date": [date(2024, 1, 2), date(2024, 1, 3)],
+        "open": [10.0, 10.2],
+        "high": [10.5, 10.8],
+        "low": [9.8, 10.1],
+        "close": [10.2, 10.6],
+        "volume": [1000000, 1200000],
+        "amount": [10200000.0, 12720000.0],
+        "pre_close": [9.9, 10.2],
+    })
 
     # 保存
     count = repo.save_kline(test_data)
@@ -73,20 +67,20 @@ def test_save_and_query(repo: KlineRepository):
     df = repo.get_kline("SHSE.600000", date(2024, 1, 1), date(2024, 1, 31))
     print(f"  查询到记录数: {len(df)}")
     if not df.empty:
-        print(f"  数据:\n{df}")
+        print(f"  数据:\n{df.head().to_string()}")
 
     # 最新日期
     latest = repo.get_latest_date("SHSE.600000")
     print(f"  最新日期: {latest}")
 
 
-def test_sync_status(repo: KlineRepository):
+def test_sync_status(kline_repo: KlineRepository):
     """测试同步状态"""
+    repo = kline_repo
     print("\n=== 测试同步状态 ===")
 
     # 标记完成
-    repo.mark_symbol_completed("SHSE.600000", date(2026, 1, 1))
-    repo.mark_symbol_completed("SZSE.000001", date(2026, 1, 1))
+    repo.mark_symbols_completed(["SHSE.600000", "SZSE.000001"], date(2026, 1, 1))
 
     # 获取已完成
     completed = repo.get_completed_symbols()
@@ -100,17 +94,79 @@ def test_sync_status(repo: KlineRepository):
     print(f"  初始化完成: {repo.is_init_completed()}")
 
 
+def test_price_precision():
+    """测试价格列存储精度（覆盖远超 2048 元的后复权价格）"""
+    print("\n=== 测试价格精度 ===")
+
+    # 0.01 ~ 100000 元之间的随机4位小数价格
+    rng = np.random.default_rng(0)
+    n = 1000
+    prices = {c: np.round(rng.uniform(0.01, 100000, n), 4) for c in PRICE_COLUMNS}
+    test_data = pd.DataFrame({
+        "symbol": [f"SHSE.{600000 + i}" for i in range(n)],
+        "date": date(2024, 1, 2),
+        **prices,
+        "volume": 1000000,
+        "amount": 10200000.0,
+    })
+
+    with TemporaryDirectory() as tmp:
+        repo = KlineRepository(Path(tmp) / "kline.duckdb")
+        repo.save_kline(test_data)
+        df = repo.get_kline(test_data["symbol"].tolist(), date(2024, 1, 1), date(2024, 1, 31))
+
+    df = df.sort_values("symbol", ignore_index=True)
+    for c in PRICE_COLUMNS:
+        max_err = np.abs(df[c].to_numpy(np.float64) - prices[c]).max()
+        print(f"  {c}: 最大误差 {max_err:.2e}")
+        assert max_err < PRICE_TOLERANCE
+
+
+def _bars(rows: list[tuple[str, date, float]]) -> pd.DataFrame:
+    """按 (symbol, date, close) 构造最简K线，其余价格列与收盘价相同"""
+    symbols, dates, closes = zip(*rows)
+    return pd.DataFrame({
+        "symbol": symbols, "date": dates,
+        "open": closes, "high": closes, "low": closes, "close": closes,
+        "volume": 100, "amount": 1000.0, "pre_close": closes,
+    })
+
+
+def test_save_keeps_other_dates():
+    """测试保存只替换相同 (股票, 日期) 的数据，不误删同区间内的其他日期"""
+    print("\n=== 测试保存不误删 ===")
+
+    with TemporaryDirectory() as tmp:
+        repo = KlineRepository(Path(tmp) / "kline.duckdb")
+        repo.save_kline(_bars([("B", date(2023, 6, 1), 1.0), ("B", date(2024, 1, 2), 1.0)]))
+        # B 只带 2024-01-02，C 的日期跨度覆盖 B 的 2023-06-01
+        repo.save_kline(_bars([
+            ("B", date(2024, 1, 2), 2.0),
+            ("C", date(2023, 1, 1), 3.0),
+            ("C", date(2024, 12, 31), 3.0),
+        ]))
+        df = repo.get_kline("B", date(2023, 1, 1), date(2024, 12, 31))
+
+    print(f"  B 剩余记录: {len(df)}")
+    assert pd.to_datetime(df["date"]).dt.date.tolist() == [date(2023, 6, 1), date(2024, 1, 2)]
+    assert df["close"].tolist() == [1.0, 2.0]
+
+
 def main():
     print("=" * 50)
     print("K线仓库测试")
     print("=" * 50)
 
-    config = load_config()
-    repo = KlineRepository(config.database.daily_kline)
+    if os.environ.get("TEST_MODE") == FAST_TEST_MODE:
+        repo = KlineRepository.in_memory()
+    else:
+        repo = KlineRepository(load_config().database.daily_kline)
 
     test_basic(repo)
     test_save_and_query(repo)
     test_sync_status(repo)
+    test_price_precision()
+    test_save_keeps_other_dates()
 
     print("\n" + "=" * 50)
     print("测试完成!")
@@ -14,33 +14,33 @@ from src.data.source.juejin_client import JuejinClient
 from src.data.repository.stock_pool import StockPoolRepository
 
 
-def test_query(repo: StockPoolRepository):
+def test_query(stock_repo: StockPoolRepository):
     """测试查询功能"""
+    repo = stock_repo
     print("\n=== 测试查询功能 ===")
 
     # 全部股票
-    all_stocks = repo.get_all()
-    print(f"  全部股票: {len(all_stocks)} 只")
+    print(f"  全部股票: {repo.count()} 只")
 
-    # 按板块统计
+    # 按板块统计（一次 GROUP BY 得到各板块数量及 ST、停牌数）
+    stats = repo.board_stats()
     for board in ["main", "gem", "star", "bse"]:
-        stocks = repo.get_by_board(board)
-        print(f"  {board}: {len(stocks)} 只")
+        print(f"  {board}: {int(stats['total'].get(board, 0))} 只")
 
     # 可交易股票
     tradable = repo.get_tradable()
     print(f"  可交易(排除ST和停牌): {len(tradable)} 只")
 
-    # ST和停牌统计
-    st_count = len([s for s in all_stocks if s.is_st])
-    suspended_count = len([s for s in all_stocks if s.is_suspended])
+    # ST和停牌统计（由板块统计汇总）
+    st_count, suspended_count = int(stats["st"].sum()), int(stats["suspended"].sum())
     print(f"  ST股票: {st_count} 只")
     print(f"  停牌股票: {suspended_count} 只")
 
-    # 显示几只样例（打印全部字段）
-    if all_stocks:
+    # 显示几只样例（打印全部字段，只取样例行）
+    samples = repo.get_sample(3)
+    if samples:
         print("\n  样例股票:")
-        for s in all_stocks[:3]:
+        for s in samples:
             print(f"    {asdict(s)}")
 
 
@@ -7,15 +7,19 @@
     python -m tests.data.test_trading_calendar init   # 初始化同步（清空后从2022年开始）
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 
+import pandas as pd
+
 from src.common.config import load_config
 from src.data.source.juejin_client import JuejinClient
 from src.data.repository.trading_calendar import TradingCalendarRepository
 
 
-def test_query(repo: TradingCalendarRepository):
+def test_query(cal_repo: TradingCalendarRepository):
     """测试查询功能"""
+    repo = cal_repo
     print("\n=== 测试查询功能 ===")
 
     today = date.today()
@@ -25,13 +29,18 @@ def test_query(repo: TradingCalendarRepository):
     print(f"  上交所日期范围: {min_date} ~ {max_date}")
 
     # 全部交易日
-    all_days = repo.get_all_trading_days("SHSE")
+    all_days = repo.get_trading_day_array("SHSE")
     print(f"  上交所交易日总数: {len(all_days)} 天")
 
     # 判断今天
     is_trading = repo.is_trading_day("SHSE", today)
     print(f"  今天 {today} 是否交易日: {is_trading}")
 
+    # 批量判断前后10天
+    window = pd.date_range(today - timedelta(days=10), today + timedelta(days=10))
+    flags = repo.is_trading_day_batch("SHSE", window)
+    print(f"  前后10天交易日数(批量判断): {int(flags.sum())}")
+
     # 前后交易日
     prev_day = repo.get_prev_trading_day("SHSE", today)
     next_day = repo.get_next_trading_day("SHSE", today)
@@ -43,8 +52,9 @@ def test_query(repo: TradingCalendarRepository):
     print(f"  前后10天的交易日: {days}")
 
 
-def test_sync_status(repo: TradingCalendarRepository):
+def test_sync_status(cal_repo: TradingCalendarRepository):
     """测试同步状态"""
+    repo = cal_repo
     print("\n=== 同步状态 ===")
 
     last_sync = repo.get_last_sync_time()
@@ -71,10 +81,17 @@ def init_sync():
     start_date = date(2022, 1, 1)
     end_date = today + timedelta(days=180)
 
-    for exchange in ["SHSE", "SZSE"]:
+    # 两个交易所并发拉取，写库仍在主线程逐个完成
+    exchanges = ["SHSE", "SZSE"]
+    with ThreadPoolExecutor(max_workers=len(exchanges)) as executor:
+        futures = {
+            exchange: executor.submit(client.get_trading_calendar, exchange, start_date, end_date)
+            for exchange in exchanges
+        }
+
+    for exchange in exchanges:
         print(f"\n同步 {exchange}: {start_date} ~ {end_date}")
-        trading_days = client.get_trading_calendar(exchange, start_date, end_date)
-        count = repo.save(trading_days)
+        count = repo.save(futures[exchange].result())
         print(f"  保存 {count} 条")
 
     # 验证